@@ -0,0 +1,54 @@
+# app/agent_stub.py
+# 로컬 개발/테스트용 moderation agent 대역
+#   uvicorn app.agent_stub:app --port 9000   (AGENT_BASE_URL=http://localhost:9000)
+# - 실제 agent 와 같은 계약: POST /moderate, POST /moderate/batch
+# - AGENT_STUB_BLOCKLIST 단어가 들어 있으면 hidden, 그 외 safe
+# - AGENT_STUB_DELAY_MS 로 호출당 지연(모델 호출 비용) 흉내
+import os
+import time
+from fastapi import FastAPI, Header, HTTPException
+from pydantic import BaseModel
+
+BLOCKLIST = [w for w in os.getenv("AGENT_STUB_BLOCKLIST", "spam").split(",") if w]
+DELAY_MS = int(os.getenv("AGENT_STUB_DELAY_MS", "0"))
+
+app = FastAPI(title="moderation agent stub")
+
+
+class ModerateItem(BaseModel):
+    target_type: str
+    target_id: int
+    content: str
+
+
+class ModerateBatch(BaseModel):
+    items: list[ModerateItem]
+
+
+def _judge(item: ModerateItem) -> dict:
+    hit = next((w for w in BLOCKLIST if w in item.content.lower()), None)
+    return {
+        "target_type": item.target_type,
+        "target_id": item.target_id,
+        "action": "hidden" if hit else "safe",
+        "reason": f"blocklist: {hit}" if hit else None,
+    }
+
+
+def _check_internal(x_internal_call: str | None) -> None:
+    if x_internal_call != "true":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@app.post("/moderate")
+def moderate(item: ModerateItem, x_internal_call: str | None = Header(None)):
+    _check_internal(x_internal_call)
+    time.sleep(DELAY_MS / 1000)
+    return _judge(item)
+
+
+@app.post("/moderate/batch")
+def moderate_batch(body: ModerateBatch, x_internal_call: str | None = Header(None)):
+    _check_internal(x_internal_call)
+    time.sleep(DELAY_MS / 1000)     # 배치도 호출 1회 비용
+    return {"results": [_judge(item) for item in body.items]}
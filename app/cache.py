@@ -0,0 +1,188 @@
+# app/cache.py
+# Redis 기반 읽기 캐시 (app.queue 의 Redis 연결 재사용)
+# - Redis 장애 시에는 캐시를 건너뛰고 DB로 처리
+import os
+import re
+import time
+import json
+import hashlib
+import unicodedata
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from app.queue import redis
+from app.metrics import FEED_CACHE_REQUESTS, USER_CACHE_REQUESTS, MODERATION_VERDICT_CACHE_REQUESTS
+
+
+# -----------------------------
+# 피드 페이지 캐시
+# - 해시 하나에 (last_id, size) 필드로 페이지 저장 → 무효화는 DEL 한 번
+# -----------------------------
+FEED_CACHE_KEY = "cache:feed:pages"
+FEED_INVALIDATED_AT_KEY = "cache:feed:invalidated_at"    # 마지막 무효화 시각 (복제본 페이지 캐시 여부 판단)
+FEED_CACHE_TTL = int(os.getenv("FEED_CACHE_TTL", "30"))     # 초 (좋아요/조회수 지연 허용 범위)
+
+
+def _feed_field(last_id: int | None, size: int) -> str:
+    return f"{last_id or 0}:{size}"
+
+
+def get_feed_page(last_id: int | None, size: int) -> dict | None:
+    """캐시된 피드 페이지 반환 (없으면 None)"""
+    try:
+        raw = redis.hget(FEED_CACHE_KEY, _feed_field(last_id, size))
+    except RedisError:
+        FEED_CACHE_REQUESTS.labels(result="error").inc()
+        return None
+
+    if raw is None:
+        FEED_CACHE_REQUESTS.labels(result="miss").inc()
+        return None
+
+    FEED_CACHE_REQUESTS.labels(result="hit").inc()
+    return json.loads(raw)
+
+
+def set_feed_page(last_id: int | None, size: int, page: dict) -> None:
+    """피드 페이지 저장 (TTL은 해시 단위, 첫 저장 시점부터)"""
+    try:
+        pipe = redis.pipeline()
+        pipe.hset(FEED_CACHE_KEY, _feed_field(last_id, size), json.dumps(jsonable_encoder(page)))
+        pipe.expire(FEED_CACHE_KEY, FEED_CACHE_TTL, nx=True)
+        pipe.execute()
+    except RedisError:
+        pass
+
+
+def invalidate_feed() -> None:
+    """게시글 생성/수정/삭제/노출 변경 시 호출"""
+    try:
+        pipe = redis.pipeline()
+        pipe.delete(FEED_CACHE_KEY)
+        pipe.set(FEED_INVALIDATED_AT_KEY, time.time(), ex=3600)
+        pipe.execute()
+    except RedisError:
+        pass
+
+
+def feed_invalidated_within(seconds: float) -> bool:
+    """최근 seconds 초 안에 피드가 무효화됐는지 (판단 불가면 True)"""
+    try:
+        raw = redis.get(FEED_INVALIDATED_AT_KEY)
+    except RedisError:
+        return True
+    return raw is not None and time.time() - float(raw) < seconds
+
+
+# -----------------------------
+# 인증 유저(principal) 캐시
+# - get_current_user 의 PK 조회 대체
+# - 프로필/비밀번호 변경, 탈퇴 시 명시적으로 무효화
+# -----------------------------
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))     # 초
+
+
+def _user_key(user_id: int) -> str:
+    return f"cache:user:{user_id}"
+
+
+def get_cached_user(user_id: int) -> dict | None:
+    try:
+        raw = redis.get(_user_key(user_id))
+    except RedisError:
+        USER_CACHE_REQUESTS.labels(result="error").inc()
+        return None
+
+    if raw is None:
+        USER_CACHE_REQUESTS.labels(result="miss").inc()
+        return None
+
+    USER_CACHE_REQUESTS.labels(result="hit").inc()
+    return json.loads(raw)
+
+
+def set_cached_user(user_id: int, data: dict) -> None:
+    try:
+        redis.set(_user_key(user_id), json.dumps(data), ex=USER_CACHE_TTL)
+    except RedisError:
+        pass
+
+
+def invalidate_user(user_id: int) -> None:
+    try:
+        redis.delete(_user_key(user_id))
+    except RedisError:
+        pass
+
+
+# -----------------------------
+# 모더레이션 판정 캐시
+# - 정규화한 본문의 sha256 → agent 판정 (같은 글이 반복되면 agent 호출 없이 반영)
+# - 키에 정책 버전 포함 → agent 정책이 바뀌면 MODERATION_POLICY_VERSION 만 올리면 전부 miss
+# - 확정 판정(safe / hidden)만 저장 (review 는 agent 오류 대체값일 수 있어서 제외)
+# -----------------------------
+MODERATION_POLICY_VERSION = os.getenv("MODERATION_POLICY_VERSION", "1")
+MODERATION_VERDICT_TTL = int(os.getenv("MODERATION_VERDICT_TTL", str(24 * 3600)))   # 초
+CACHEABLE_ACTIONS = {"safe", "hidden"}
+
+_REPEATED_CHAR = re.compile(r"(.)\1{3,}")
+
+
+def normalize_moderation_text(content: str) -> str:
+    """판정에 영향 없는 차이 제거: 유니코드 호환 정규화, 소문자, 공백 정리, 4회 이상 반복 문자는 3회로"""
+    text = unicodedata.normalize("NFKC", content).lower()
+    text = " ".join(text.split())
+    return _REPEATED_CHAR.sub(r"\1\1\1", text)
+
+
+def _verdict_key(content: str, policy_version: str) -> str:
+    digest = hashlib.sha256(normalize_moderation_text(content).encode()).hexdigest()
+    return f"cache:moderation:{policy_version}:{digest}"
+
+
+def get_cached_verdicts(contents: list[str]) -> list[tuple[str, str | None] | None]:
+    """본문별 캐시된 (action, reason), 없으면 None (Redis 장애 시 전부 None)"""
+    if not contents:
+        return []
+
+    try:
+        raws = redis.mget([_verdict_key(c, MODERATION_POLICY_VERSION) for c in contents])
+    except RedisError:
+        MODERATION_VERDICT_CACHE_REQUESTS.labels(result="error").inc(len(contents))
+        return [None] * len(contents)
+
+    verdicts = []
+    for raw in raws:
+        if raw is None:
+            MODERATION_VERDICT_CACHE_REQUESTS.labels(result="miss").inc()
+            verdicts.append(None)
+        else:
+            MODERATION_VERDICT_CACHE_REQUESTS.labels(result="hit").inc()
+            data = json.loads(raw)
+            verdicts.append((data["action"], data.get("reason")))
+    return verdicts
+
+
+def set_cached_verdicts(
+    entries: list[tuple[str, str, str | None]],
+    policy_version: str | None = None,
+) -> None:
+    """(content, action, reason) 저장. agent 가 알려준 정책 버전이 설정과 다르면 저장하지 않음"""
+    if policy_version is not None and str(policy_version) != MODERATION_POLICY_VERSION:
+        return
+
+    entries = [e for e in entries if e[1] in CACHEABLE_ACTIONS]
+    if not entries:
+        return
+
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for content, action, reason in entries:
+            pipe.set(
+                _verdict_key(content, MODERATION_POLICY_VERSION),
+                json.dumps({"action": action, "reason": reason}),
+                ex=MODERATION_VERDICT_TTL,
+            )
+        pipe.execute()
+    except RedisError:
+        pass
@@ -1,29 +1,38 @@
 # app/controllers/auth_controller.py
 from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import re
-import uuid
-import os
 
 from app.crud.user_crud import (
-    create_user,
-    get_user_by_email,
-    is_nickname_duplicated,
+    create_user_async,
+    get_user_by_email_async,
+    get_user_by_id_async,
+    is_nickname_duplicated_async,
+    get_user_by_id,
     delete_user,
-    update_user_password,
-    update_user_profile,
+    update_user_password_async,
+    update_user_profile_async,
 )
-from app.core.security import hash_password, verify_password
+from app.cache import invalidate_user, invalidate_feed
+from app.queue import enqueue_image_variants
+from app.core.uploads import save_image_upload
+from app.crud.upload_crud import acquire_upload_async, release_upload_async
+from app.core.security import (
+    hash_password_async,
+    verify_password_async,
+    verify_and_update_password_async,
+)
+from app.dependencies.auth import CurrentUser
 from app.models.user_model import User                        
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+UPLOAD_DIR = "uploads"   # 폴더 생성은 main.lifespan 에서
 
 
 # -----------------------------
 # 로그인 컨트롤러 (User 객체 반환)
 # -----------------------------
-def login_controller(db: Session, payload: dict) -> User:
+async def login_controller(db: Session, payload: dict) -> User:
     email = (payload.get("email") or "").strip()
     pw = payload.get("password") or ""
 
@@ -45,14 +54,19 @@ def login_controller(db: Session, payload: dict) -> User:
         raise HTTPException(status_code=400, detail="비밀번호는 8~20자입니다.")
 
     # 3) 사용자 찾기
-    user = get_user_by_email(db, email)
+    user = await get_user_by_email_async(db, email)
     if user is None:
         raise HTTPException(status_code=400, detail="아이디 또는 비밀번호를 확인해주세요.")
 
-    # 4) 비밀번호 검증 (해시)
-    if not verify_password(pw, user.password):
+    # 4) 비밀번호 검증 (해시, 해싱 풀에서)
+    verified, new_hash = await verify_and_update_password_async(pw, user.password)
+    if not verified:
         raise HTTPException(status_code=400, detail="아이디 또는 비밀번호를 확인해주세요.")
 
+    # 해싱 정책(rounds)이 바뀐 예전 해시면 로그인 시 재해싱해서 저장
+    if new_hash:
+        user = await update_user_password_async(db, user, new_hash)
+
     # 5) 로그인 성공 → User 반환 (토큰 발급은 라우터에서)
     return user
 
@@ -88,46 +102,34 @@ async def signup_controller(db: Session, payload: dict, profile_image: UploadFil
         raise HTTPException(status_code=400, detail="비밀번호와 비밀번호 확인이 일치하지 않습니다.")
 
     # 4. 이메일/닉네임 중복 체크
-    if get_user_by_email(db, email):
+    if await get_user_by_email_async(db, email):
         raise HTTPException(status_code=400, detail="이미 사용 중인 이메일입니다.")
-    if is_nickname_duplicated(db, nickname):
+    if await is_nickname_duplicated_async(db, nickname):
         raise HTTPException(status_code=400, detail="이미 사용 중인 닉네임입니다.")
 
     # 5. 프로필 이미지 처리
     if profile_image is None or not profile_image.filename:
         raise HTTPException(status_code=400, detail="프로필 이미지를 업로드해주세요.")
 
-    allowed_ext = {"jpg", "jpeg", "png", "gif", "webp"}
-    ext = profile_image.filename.rsplit(".", 1)[-1].lower()
-    if ext not in allowed_ext:
-        raise HTTPException(
-            status_code=400,
-            detail="허용되지 않은 이미지 형식입니다. (jpg, jpeg, png, gif, webp만 가능)",
-        )
-
-    allowed_mime = {"image/jpeg", "image/png", "image/gif", "image/webp"}
-    if profile_image.content_type not in allowed_mime:
-        raise HTTPException(
-            status_code=400,
-            detail="이미지 파일 형식이 올바르지 않습니다.",
-        )
-
-    file_name = f"{uuid.uuid4()}.{ext}"
-    file_path = os.path.join(UPLOAD_DIR, file_name)
-
-    with open(file_path, "wb") as f:
-        f.write(await profile_image.read())
+    staged = await save_image_upload(profile_image, UPLOAD_DIR)
+    file_path = await acquire_upload_async(db, staged)
 
     # 6. 비밀번호 해시 후 DB 저장
-    hashed_pw = hash_password(password)
+    try:
+        hashed_pw = await hash_password_async(password)
+
+        user = await create_user_async(
+            db,
+            email=email,
+            password=hashed_pw,
+            nickname=nickname,
+            profile_image_path=file_path,
+        )
+    except Exception:
+        await release_upload_async(db, file_path)
+        raise
 
-    user = create_user(
-        db=db,
-        email=email,
-        password=hashed_pw,
-        nickname=nickname,
-        profile_image_path=file_path,
-    )
+    await run_in_threadpool(enqueue_image_variants, "user", user.id, file_path)
 
     return {
         "message": "회원가입 성공",
@@ -141,8 +143,8 @@ async def signup_controller(db: Session, payload: dict, profile_image: UploadFil
 # 회원정보 수정 (JWT 기반)
 # -----------------------------
 async def update_profile_controller(
-    db: Session,
-    user: User,        # 현재 로그인 유저
+    db: Session,       # get_async_db 세션 (Session 또는 AsyncSession)
+    user: CurrentUser, # 현재 로그인 유저
     payload: dict,
     profile_image: UploadFile | None,
 ):
@@ -155,66 +157,45 @@ async def update_profile_controller(
         raise HTTPException(status_code=400, detail="닉네임은 최대 10자까지 작성 가능합니다.")
 
     # 2) 닉네임 중복 (본인 제외, id 기준)
-    if is_nickname_duplicated(db, nickname, exclude_user_id=user.id):
+    if await is_nickname_duplicated_async(db, nickname, exclude_user_id=user.id):
         raise HTTPException(status_code=400, detail="중복된 닉네임 입니다.")
 
     profile_image_path = None
 
     # 3) 프로필 이미지 처리
     if profile_image is not None and profile_image.filename:
-        allowed_ext = {"jpg", "jpeg", "png", "gif", "webp"}
-        ext = profile_image.filename.rsplit(".", 1)[-1].lower()
-        if ext not in allowed_ext:
-            raise HTTPException(
-                status_code=400,
-                detail="허용되지 않은 이미지 형식입니다. (jpg, jpeg, png, gif, webp만 가능)",
-            )
-
-        allowed_mime = {"image/jpeg", "image/png", "image/gif", "image/webp"}
-        if profile_image.content_type not in allowed_mime:
-            raise HTTPException(
-                status_code=400,
-                detail="이미지 파일 형식이 올바르지 않습니다.",
-            )
-
-        file_name = f"{uuid.uuid4()}.{ext}"
-        file_path = os.path.join(UPLOAD_DIR, file_name)
-
-        with open(file_path, "wb") as f:
-            f.write(await profile_image.read())
-
-        # 기존 이미지 삭제
-        old_path = user.profile_image_path
-        if old_path and os.path.exists(old_path):
-            try:
-                os.remove(old_path)
-            except OSError:
-                pass
-
-        profile_image_path = file_path
-
-    # 4) DB 변경
-    user = update_user_profile(db, user, nickname, profile_image_path)
+        staged = await save_image_upload(profile_image, UPLOAD_DIR)
+        profile_image_path = await acquire_upload_async(db, staged)
 
-    return user
+    # 4) DB 변경 (CurrentUser 는 ORM 이 아니므로 이 세션에서 로드)
+    #    기존 이미지 참조 해제도 같은 트랜잭션에서 (파일은 GC 가 정리)
+    try:
+        user_row = await get_user_by_id_async(db, user.id)
+        user_row = await update_user_profile_async(db, user_row, nickname, profile_image_path)
+    except Exception:
+        await release_upload_async(db, profile_image_path)
+        raise
+    await run_in_threadpool(invalidate_user, user.id)
+
+    # 새 이미지 썸네일 생성
+    if profile_image_path is not None:
+        await run_in_threadpool(enqueue_image_variants, "user", user.id, profile_image_path)
+
+    return user_row
 
 
 # -----------------------------
 # 회원 탈퇴 (JWT 기반)
 # -----------------------------
-def delete_account_controller(db: Session, user: User) -> dict:
-    # 1) 프로필 이미지 경로 미리 저장
-    profile_path = user.profile_image_path
-
-    # 2) 유저 삭제
-    deleted = delete_user(db, user)
+def delete_account_controller(db: Session, user: CurrentUser) -> dict:
+    user_row = get_user_by_id(db, user.id)
+    if user_row is None:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
-    # 3) 프로필 이미지 파일 삭제
-    if profile_path and os.path.exists(profile_path):
-        try:
-            os.remove(profile_path)
-        except OSError:
-            pass
+    # 유저 삭제 (프로필/게시글 이미지 참조도 같이 해제, 파일은 GC 가 정리)
+    deleted = delete_user(db, user_row)
+    invalidate_user(user.id)
+    invalidate_feed()   # 게시글도 CASCADE 로 삭제됨
 
     return {
         "message": "회원 탈퇴가 완료되었습니다.",
@@ -225,7 +206,7 @@ def delete_account_controller(db: Session, user: User) -> dict:
 # -----------------------------
 # 비밀번호 수정 (JWT 기반)
 # -----------------------------
-def update_password_controller(db: Session, user: User, payload: dict) -> dict:
+async def update_password_controller(db: Session, user: CurrentUser, payload: dict) -> dict:
     new_pw = payload.get("new_password") or ""
     new_pw_confirm = payload.get("new_password_confirm") or ""
 
@@ -245,13 +226,17 @@ def update_password_controller(db: Session, user: User, payload: dict) -> dict:
     if new_pw != new_pw_confirm:
         raise HTTPException(status_code=400, detail="비밀번호와 비밀번호 확인이 일치하지 않습니다.")
 
-    # 3) 기존 비밀번호와 동일한지 (해시 기준 비교)
-    if verify_password(new_pw, user.password):
+    # 3) 기존 비밀번호와 동일한지 (해시 기준 비교, 해시는 DB에서)
+    user_row = await get_user_by_id_async(db, user.id)
+    if user_row is None:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    if await verify_password_async(new_pw, user_row.password):
         raise HTTPException(status_code=400, detail="기존 비밀번호와 동일한 비밀번호는 사용할 수 없습니다.")
 
     # 4) 새 비밀번호 해시 후 저장
-    hashed_pw = hash_password(new_pw)
-    update_user_password(db, user, hashed_pw)
+    hashed_pw = await hash_password_async(new_pw)
+    await update_user_password_async(db, user_row, hashed_pw)
+    await run_in_threadpool(invalidate_user, user.id)
 
     return {
         "message": "비밀번호가 성공적으로 수정되었습니다.",
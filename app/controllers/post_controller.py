@@ -1,29 +1,53 @@
 # app/controllers/post_controller.py
 from fastapi import HTTPException, UploadFile, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
-import os, uuid
-from app.models.post_model import Comment
-from app.queue import redis, moderation_q
-from app.jobs import run_moderation
+from datetime import datetime
+import os, base64
+from app.schemas import (
+    CommentOut,
+    CommentPageResponse,
+    CommentWriteResponse,
+    PostDetail,
+    PostDetailResponse,
+    PostListResponse,
+    PostOut,
+    PostSummary,
+    PostWriteResponse,
+)
+from app.queue import enqueue_image_variants
+from app.cache import get_feed_page, set_feed_page, invalidate_feed, feed_invalidated_within
+from app.counters import record_view, pending_views
+from app.core.uploads import save_image_upload
+from app.crud.upload_crud import acquire_upload_async, release_upload_async
 
 
 
 from app.crud.post_crud import (
-    create_post,
+    create_post_async,
     delete_post, 
     get_post_or_404,
-    increase_views,
-    toggle_like,
-    update_post,
+    ensure_post_visible,
+    get_post_detail_row,
+    like_post,
+    unlike_post,
+    has_liked,
+    update_post_async,
     add_comment,
     update_comment,
     delete_comment,
-    list_posts_cursor
+    list_posts_cursor,
+    list_comments_cursor,
 )
-from app.models.user_model import User   # 추가
+from app.dependencies.auth import CurrentUser   # 로그인 유저 (ORM 아님)
+from app.dependencies.db import READ_YOUR_WRITES_SEC
+
+POST_UPLOAD_DIR = "post_uploads"   # 폴더 생성은 main.lifespan 에서
 
-POST_UPLOAD_DIR = "post_uploads"
-os.makedirs(POST_UPLOAD_DIR, exist_ok=True)
+# 상세 조회 시 함께 내려주는 첫 댓글 수 (나머지는 GET /posts/{id}/comments)
+COMMENT_PAGE_SIZE = int(os.getenv("COMMENT_PAGE_SIZE", "20"))
 
 # -----------------------------
 # 게시글 목록 조회
@@ -32,33 +56,67 @@ def list_posts_controller(
     db: Session,
     last_id: int | None,
     size: int,
-) -> dict:
-    posts = list_posts_cursor(db, last_id, size)
-
-    result: list[dict] = []
-    for p in posts:
-        result.append(
-            {
-                "id": p.id,
-                "title": p.title,
-                "content": p.content,
-                "image_path": p.image_path,
-                "likes": p.likes,
-                "views": p.views,
-                "created_at": p.created_at,
-                "user_id": p.user_id,
-                "user_nickname": p.user.nickname if p.user else None,  
-            }
+) -> PostListResponse:
+    # 방금 쓴 유저는 캐시를 건너뛰고 primary 에서 (자기 글이 빠진 캐시 페이지를 보지 않게)
+    if db.info.get("recent_write"):
+        return _merge_pending_views(_build_feed_page(db, last_id, size))
+
+    # 캐시 먼저 (첫 페이지 대부분이 여기서 끝남)
+    cached = get_feed_page(last_id, size)
+    if cached is not None:
+        try:
+            return _merge_pending_views(PostListResponse.model_validate(cached))
+        except ValidationError:
+            pass    # 응답 형식이 바뀌기 전에 캐시된 페이지 → DB에서 다시
+
+    page = _build_feed_page(db, last_id, size)
+
+    # 복제본에서 읽은 페이지는 무효화 직후(복제 지연 구간 = READ_YOUR_WRITES_SEC)에는 캐시하지 않음
+    # → 방금 쓴 글이 빠진 페이지가 TTL 동안 남지 않게 (응답은 그대로)
+    if not db.info.get("replica") or not feed_invalidated_within(READ_YOUR_WRITES_SEC):
+        set_feed_page(last_id, size, page.model_dump(mode="json"))     # 캐시에는 DB 값만 저장
+
+    return _merge_pending_views(page)
+
+
+def _build_feed_page(db: Session, last_id: int | None, size: int) -> PostListResponse:
+    rows = list_posts_cursor(db, last_id, size)
+
+    posts = [
+        PostSummary(
+            id=r.id,
+            title=r.title,
+            excerpt=r.excerpt,                      # 본문 전체는 상세에서만
+            content_length=r.content_length,
+            has_image=r.has_image,
+            # 피드는 썸네일 (아직 생성 전이면 원본)
+            image_path=r.image_thumb_path or r.image_path,
+            image_original_path=r.image_path,
+            likes=r.likes or 0,
+            views=r.views or 0,
+            comment_count=r.comment_count,
+            created_at=r.created_at,
+            user_id=r.user_id,
+            user_nickname=r.user_nickname,
         )
+        for r in rows
+    ]
 
-    next_last_id = posts[-1].id if posts else None
+    next_last_id = rows[-1].id if rows else None
+
+    return PostListResponse(
+        posts=posts,
+        last_id=next_last_id,
+        has_more=next_last_id is not None,
+    )
 
-    return {
-        "success": True,
-        "posts": result,                   # ORM 말고 순수 dict 리스트
-        "last_id": next_last_id,
-        "has_more": next_last_id is not None,
-    }
+
+def _merge_pending_views(page: PostListResponse) -> PostListResponse:
+    """아직 DB에 반영되지 않은 조회수 delta를 더해서 표시"""
+    pending = pending_views([p.id for p in page.posts])
+    for p in page.posts:
+        p.views += pending.get(p.id, 0)
+    return page
 
 
 
@@ -70,9 +128,9 @@ async def create_post_controller(
     title: str,
     content: str,
     image_file: UploadFile | None,
-    user: User,                       # 현재 로그인 유저
+    user: CurrentUser,                       # 현재 로그인 유저
     background_tasks: BackgroundTasks | None,
-) -> dict:
+) -> PostWriteResponse:
 
     title = title.strip()
     content = content.strip()
@@ -84,98 +142,117 @@ async def create_post_controller(
     if not content:
         raise HTTPException(status_code=400, detail="내용을 입력해주세요.")
 
-    # 이미지 처리
+    # 이미지 처리 (app.core.uploads 공통 파이프라인)
     image_path = None
     if image_file and image_file.filename:
-        allowed_ext = {"jpg", "jpeg", "png", "gif", "webp"}
-        ext = image_file.filename.rsplit(".", 1)[-1].lower()
-        if ext not in allowed_ext:
-            raise HTTPException(400, "허용되지 않은 이미지 형식입니다.")
-
-        allowed_mime = {"image/jpeg", "image/png", "image/gif", "image/webp"}
-        if image_file.content_type not in allowed_mime:
-            raise HTTPException(400, "이미지 MIME 타입 오류")
-
-        file_name = f"{uuid.uuid4()}.{ext}"
-        image_path = os.path.join(POST_UPLOAD_DIR, file_name)
-        with open(image_path, "wb") as f:
-            f.write(await image_file.read())
+        staged = await save_image_upload(image_file, POST_UPLOAD_DIR)
+        image_path = await acquire_upload_async(db, staged)   # 같은 내용이면 기존 파일 공유
 
     # user.id 를 함께 넘겨서 user_id 컬럼에 저장하도록
-    post = create_post(db, title, content, image_path, user_id=user.id)
-    trigger_moderation("post", post.id, post.content)
+    try:
+        post = await create_post_async(db, title, content, image_path, user_id=user.id)
+    except Exception:
+        await release_upload_async(db, image_path)     # DB 저장 실패 시 방금 잡은 참조 해제
+        raise
+    await run_in_threadpool(invalidate_feed)
+    await run_in_threadpool(enqueue_image_variants, "post", post.id, image_path)
     
-    return {"success": True, "message": "게시글이 등록되었습니다.", "post": post}
+    return PostWriteResponse(message="게시글이 등록되었습니다.", post=PostOut.model_validate(post))
 
 
 # -----------------------------
 # 게시글 상세 조회 (+ 조회수 증가)
+# - 조회수는 Redis에 기록 (DB 반영은 jobs.flush_view_counts)
 # -----------------------------
-def get_post_detail_controller(db: Session, post_id: int) -> dict:
-    post = increase_views(db, post_id)
-
-    # 댓글을 created_at 기준으로 정렬:
-    comments = (
-        db.query(Comment)
-        .filter(
-            Comment.post_id == post.id,
-            Comment.moderation_status != "HIDDEN",
-        )
-        .order_by(Comment.created_at.asc())
-        .all()
+def get_post_detail_controller(db: Session, post_id: int, user: CurrentUser) -> PostDetailResponse:
+    post = get_post_detail_row(db, post_id)
+    pending = record_view(post.id)
+
+    # 첫 댓글 페이지만 (스레드 길이와 무관하게 응답 크기 일정)
+    comment_page = _comment_page(db, post.id, None, COMMENT_PAGE_SIZE)
+
+    detail = PostDetail(
+        id=post.id,
+        title=post.title,
+        content=post.content,
+        # 상세는 중간 크기 (아직 생성 전이면 원본)
+        image_path=post.image_medium_path or post.image_path,
+        image_original_path=post.image_path,
+        likes=post.likes or 0,
+        liked=has_liked(db, post.id, user.id),
+        views=(post.views or 0) + pending,
+        comment_count=post.comment_count,
+        created_at=post.created_at,
+        user_id=post.user_id,
+        user_nickname=post.user_nickname,
+        comments=comment_page.comments,
+        comments_cursor=comment_page.cursor,
+        comments_has_more=comment_page.has_more,
     )
 
-    comment_list: list[dict] = []
-    for c in comments:
-        comment_list.append(
-            {
-                "id": c.id,
-                "post_id": c.post_id,
-                "content": c.content,
-                "writer": c.writer,        # 화면에 보여줄 닉네임
-                "user_id": c.user_id,      # 작성자 FK
-                "created_at": c.created_at,
-            }
-        )
+    return PostDetailResponse(post=detail)
 
-    post_dict = {
-        "id": post.id,
-        "title": post.title,
-        "content": post.content,
-        "image_path": post.image_path,
-        "likes": post.likes,
-        "views": post.views,
-        "created_at": post.created_at,
-        "user_id": post.user_id,
-        "user_nickname": post.user.nickname if post.user else None,
-        "comments": comment_list,     
-    }
 
-    return {
-        "success": True,
-        "post": post_dict,
-    }
+# -----------------------------
+# 댓글 목록 조회 (keyset 커서)
+# -----------------------------
+def list_comments_controller(
+    db: Session,
+    post_id: int,
+    cursor: str | None,
+    size: int,
+) -> CommentPageResponse:
+    ensure_post_visible(db, post_id)    # 숨김 게시글 댓글 노출 방지
+    after = _decode_comment_cursor(cursor) if cursor else None
+
+    return _comment_page(db, post_id, after, size)
+
+
+def _comment_page(
+    db: Session,
+    post_id: int,
+    after: tuple[datetime, int] | None,
+    size: int,
+) -> CommentPageResponse:
+    # size + 1 개 조회해서 다음 페이지 존재 여부 판단
+    rows = list_comments_cursor(db, post_id, after, size + 1)
+    has_more = len(rows) > size
+    rows = rows[:size]
+
+    return CommentPageResponse(
+        comments=[CommentOut.model_validate(r) for r in rows],
+        cursor=_encode_comment_cursor(rows[-1]) if has_more else None,
+        has_more=has_more,
+    )
+
+
+def _encode_comment_cursor(comment: Row) -> str:
+    raw = f"{comment.created_at.isoformat()}|{comment.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_comment_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, comment_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
 
 
 # -----------------------------
 # 게시글 삭제 (작성자만 가능)
 # -----------------------------
-def delete_post_controller(db: Session, post_id: int, user: User) -> dict:
+def delete_post_controller(db: Session, post_id: int, user: CurrentUser) -> dict:
     # 우선 게시글을 가져와서 작성자인지 확인
     post = get_post_or_404(db, post_id)
 
     if post.user_id != user.id:
         raise HTTPException(status_code=403, detail="본인이 작성한 게시글만 삭제할 수 있습니다.")
 
-    # 실제 삭제
-    deleted_post = delete_post(db, post_id)
-
-    # 이미지 파일 같이 지우기 (있으면)
-    if deleted_post.image_path and os.path.exists(deleted_post.image_path):
-        try:
-            os.remove(deleted_post.image_path)
-        except OSError:
-            pass
+    # 실제 삭제 (이미지 참조도 같은 트랜잭션에서 해제, 파일은 GC 가 정리)
+    delete_post(db, post_id)
+    invalidate_feed()
 
     return {
         "success": True,
@@ -185,11 +262,26 @@ def delete_post_controller(db: Session, post_id: int, user: User) -> dict:
 
 
 # -----------------------------
-# 좋아요 토글 (로그인 여부는 선택)
+# 좋아요 / 좋아요 취소 (로그인 유저, 멱등)
 # -----------------------------
-def toggle_like_controller(db: Session, post_id: int, liked_now: bool) -> dict:
-    post = toggle_like(db, post_id, liked_now)
-    return {"success": True, "likes": post.likes, "liked": not liked_now}
+def like_post_controller(db: Session, post_id: int, user: CurrentUser) -> dict:
+    likes = like_post(db, post_id, user.id)
+    return {"success": True, "likes": likes, "liked": True}
+
+
+def unlike_post_controller(db: Session, post_id: int, user: CurrentUser) -> dict:
+    likes = unlike_post(db, post_id, user.id)
+    return {"success": True, "likes": likes, "liked": False}
+
+
+# -----------------------------
+# 좋아요 토글 (기존 프론트 호환)
+# - liked_now 는 "현재 상태"로만 사용, 실제 증감은 유저별 원장 기준
+# -----------------------------
+def toggle_like_controller(db: Session, post_id: int, liked_now: bool, user: CurrentUser) -> dict:
+    if liked_now:
+        return unlike_post_controller(db, post_id, user)
+    return like_post_controller(db, post_id, user)
 
 
 # -----------------------------
@@ -199,9 +291,9 @@ def add_comment_controller(
     db: Session,
     post_id: int,
     content: str,
-    user: User,
+    user: CurrentUser,
     background_tasks: BackgroundTasks | None,
-) -> dict:
+) -> CommentWriteResponse:
     if not content.strip():
         raise HTTPException(400, "댓글 내용을 입력해주세요.")
 
@@ -214,9 +306,8 @@ def add_comment_controller(
     )
 
     comment = data["comment"]
-    trigger_moderation("comment", comment.id, comment.content)
 
-    return {"success": True, "comment": comment}
+    return CommentWriteResponse(comment=CommentOut.model_validate(comment))
 
 
 
@@ -228,9 +319,9 @@ def update_comment_controller(
     post_id: int,
     comment_id: int,
     content: str,
-    user: User,
+    user: CurrentUser,
     background_tasks: BackgroundTasks | None,
-) -> dict:
+) -> CommentWriteResponse:
     if not content.strip():
         raise HTTPException(400, "댓글 내용을 입력해주세요.")
 
@@ -241,8 +332,7 @@ def update_comment_controller(
         content=content,
         user_id=user.id,    # 본인 댓글인지 crud쪽에서 확인 가능하게
     )
-    trigger_moderation("comment", comment.id, comment.content)
-    return {"success": True, "comment": comment}
+    return CommentWriteResponse(comment=CommentOut.model_validate(comment))
 
 
 # -----------------------------
@@ -252,7 +342,7 @@ def delete_comment_controller(
     db: Session,
     post_id: int,
     comment_id: int,
-    user: User,          # 로그인 유저
+    user: CurrentUser,          # 로그인 유저
 ) -> dict:
     remaining = delete_comment(
         db=db,
@@ -272,9 +362,9 @@ async def update_post_controller(
     title: str,
     content: str,
     image_file: UploadFile | None,
-    user: User,         
+    user: CurrentUser,         
     background_tasks: BackgroundTasks | None,
-) -> dict:
+) -> PostWriteResponse:
 
     title = title.strip()
     content = content.strip()
@@ -288,59 +378,23 @@ async def update_post_controller(
 
     new_image_path = None
     if image_file and image_file.filename:
-        allowed_ext = {"jpg", "jpeg", "png", "gif", "webp"}
-        ext = image_file.filename.rsplit(".", 1)[-1].lower()
-        if ext not in allowed_ext:
-            raise HTTPException(400, "허용되지 않은 이미지입니다.")
-
-        allowed_mime = {"image/jpeg", "image/png", "image/gif", "image/webp"}
-        if image_file.content_type not in allowed_mime:
-            raise HTTPException(400, "이미지 MIME 오류")
-
-        file_name = f"{uuid.uuid4()}.{ext}"
-        new_image_path = os.path.join(POST_UPLOAD_DIR, file_name)
-        with open(new_image_path, "wb") as f:
-            f.write(await image_file.read())
+        staged = await save_image_upload(image_file, POST_UPLOAD_DIR)
+        new_image_path = await acquire_upload_async(db, staged)
 
     # 수정 시에도 작성자인지 체크하도록 user_id 함께 전달
-    post = update_post(
-        db=db,
-        post_id=post_id,
-        title=title,
-        content=content,
-        new_image_path=new_image_path,
-        user_id=user.id,      # 작성자 검증용
-    )
-    
-    trigger_moderation("post", post.id, post.content)
-
-    return {"success": True, "message": "게시글이 수정되었습니다.", "post": post}
-
-
-
-
-# -----------------------------
-# agent 트리거
-# -----------------------------
-def trigger_moderation(target_type: str, target_id: int, content: str):
-    lock_key = f"moderation:lock:{target_type}:{target_id}"
-
-    # 중복 enqueue 방지 (2분)
-    if not redis.set(lock_key, "1", nx=True, ex=120):
-        return
-
-    moderation_q.enqueue(
-        run_moderation,
-        target_type,
-        target_id,
-        content,
-        job_timeout=60,     # 실행 제한
-        result_ttl=600,     # 결과 보관(옵션)
-        failure_ttl=600,    # 실패 보관(옵션)
-    )
-
-
-
-
+    try:
+        post = await update_post_async(
+            db,
+            post_id=post_id,
+            title=title,
+            content=content,
+            new_image_path=new_image_path,
+            user_id=user.id,      # 작성자 검증용
+        )
+    except Exception:
+        await release_upload_async(db, new_image_path)   # 권한 없음/404 등으로 실패하면 새 참조 해제
+        raise
+    await run_in_threadpool(invalidate_feed)
+    await run_in_threadpool(enqueue_image_variants, "post", post.id, new_image_path)
 
-        
+    return PostWriteResponse(message="게시글이 수정되었습니다.", post=PostOut.model_validate(post))
@@ -0,0 +1,62 @@
+# app/core/images.py
+# 업로드 이미지 파생본 생성 (RQ images 큐 워커에서 실행)
+# - 가로 폭 기준으로 축소 + WebP 재압축
+# - 애니메이션 GIF/WebP 는 원본 유지 (첫 프레임만 남는 것 방지)
+import os
+import tempfile
+from PIL import Image, ImageOps
+
+from app.core.uploads import IMAGE_VARIANT_WIDTHS, variant_path
+
+WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+
+
+def make_image_variants(src_path: str, names: tuple[str, ...] | None = None) -> dict[str, str]:
+    """원본으로부터 파생 이미지 생성 후 {variant: 경로} 반환 (생성 불가 시 빈 dict)"""
+    if not os.path.exists(src_path):
+        return {}
+
+    wanted = {
+        name: width for name, width in IMAGE_VARIANT_WIDTHS.items()
+        if names is None or name in names
+    }
+
+    # 내용 주소 저장이라 같은 원본의 파생본은 내용도 같음 → 이미 있으면 재사용
+    existing = {name: variant_path(src_path, name) for name in wanted}
+    if all(os.path.exists(path) for path in existing.values()):
+        return existing
+
+    with Image.open(src_path) as img:
+        if getattr(img, "is_animated", False):
+            return {}
+
+        img = ImageOps.exif_transpose(img)
+        mode = "RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB"
+        img = img.convert(mode)
+
+        variants: dict[str, str] = {}
+        for name, width in wanted.items():
+            resized = img.copy()
+            if resized.width > width:
+                height = round(resized.height * width / resized.width)
+                resized = resized.resize((width, height), Image.LANCZOS)
+
+            dest = variant_path(src_path, name)
+            _save_webp_atomic(resized, dest)
+            variants[name] = dest
+
+    return variants
+
+
+def _save_webp_atomic(img: Image.Image, dest: str) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest) or ".", prefix=".variant-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            img.save(f, format="WEBP", quality=WEBP_QUALITY, method=4)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -2,11 +2,22 @@
 from datetime import datetime, timedelta
 from typing import Optional
 import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from fastapi import HTTPException
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
+from app.metrics import (
+    PASSWORD_HASH_PENDING,
+    PASSWORD_HASH_QUEUE_WAIT,
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_REJECTED,
+)
+
 # .env 로드
 load_dotenv()
 
@@ -14,7 +25,25 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# 해싱 비용 조정: 값을 올리면 기존 해시는 다음 로그인 때 자동 재해싱 (needs_update)
+PASSWORD_HASH_ROUNDS = os.getenv("PASSWORD_HASH_ROUNDS")
+
+_crypt_options = {}
+if PASSWORD_HASH_ROUNDS:
+    _crypt_options = {
+        "pbkdf2_sha256__default_rounds": int(PASSWORD_HASH_ROUNDS),
+        "pbkdf2_sha256__min_rounds": int(PASSWORD_HASH_ROUNDS),
+    }
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto", **_crypt_options)
+
+# 해싱 전용 스레드 풀 (pbkdf2는 GIL을 놓으므로 스레드로 병렬 처리 가능)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))   # 대기 + 실행 상한
+
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash")
+_hash_pending = 0   # 이벤트 루프 스레드에서만 변경
+
 
 def hash_password(password: str) -> str:
     """비밀번호 해시 생성"""
@@ -26,6 +55,55 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+# -----------------------------
+# 비동기 버전 (async 라우트용, 해싱 풀에서 실행)
+# -----------------------------
+async def _run_in_hash_pool(op: str, fn, *args):
+    """
+    해싱 풀에 작업 제출
+    - 대기열이 상한을 넘으면 503 (로그인 폭주가 다른 API 스레드풀을 잠식하지 않도록)
+    """
+    global _hash_pending
+
+    if _hash_pending >= PASSWORD_HASH_MAX_PENDING:
+        PASSWORD_HASH_REJECTED.inc()
+        raise HTTPException(status_code=503, detail="요청이 많습니다. 잠시 후 다시 시도해주세요.")
+
+    submitted = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        PASSWORD_HASH_QUEUE_WAIT.observe(started - submitted)
+        try:
+            return fn(*args)
+        finally:
+            PASSWORD_HASH_DURATION.labels(op=op).observe(time.perf_counter() - started)
+
+    _hash_pending += 1
+    PASSWORD_HASH_PENDING.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, timed)
+    finally:
+        _hash_pending -= 1
+        PASSWORD_HASH_PENDING.dec()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool("hash", pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool("verify", pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str,
+) -> tuple[bool, str | None]:
+    """검증 + 필요 시 새 해시 반환 (rounds 변경 등으로 needs_update 인 경우)"""
+    return await _run_in_hash_pool("verify", pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """JWT 액세스 토큰 생성"""
     to_encode = data.copy()
@@ -39,7 +117,3 @@ def decode_access_token(token: str) -> dict:
     """JWT 디코딩(검증). 유효하지 않으면 JWTError 예외 발생"""
     payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     return payload
-
-
-
-
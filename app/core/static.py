@@ -0,0 +1,148 @@
+# app/core/static.py
+# 업로드 이미지 서빙 (/post_uploads, /uploads)
+# - 파일 이름이 내용 해시/uuid 라 한 번 저장된 경로의 내용은 바뀌지 않음 → immutable 장기 캐시
+# - strong ETag(파일 이름) + If-None-Match 304
+# - Range 요청은 단일 구간만 206 (여러 구간은 200 전체 응답, 범위 밖이면 416)
+# - accel_redirect 지정 시 본문은 앞단 nginx 가 sendfile 로 전송 (X-Accel-Redirect)
+import os
+import mimetypes
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+STATIC_CACHE_MAX_AGE = int(os.getenv("STATIC_CACHE_MAX_AGE", str(365 * 24 * 3600)))   # 1년
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+class ImmutableStaticFiles(StaticFiles):
+    def __init__(self, *args, accel_redirect: str | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # 예: "/_protected/post_uploads/" → nginx internal location 으로 넘김
+        self.accel_redirect = accel_redirect
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        size = stat_result.st_size
+        etag = f'"{os.path.basename(full_path)}"'
+
+        headers = {
+            "Cache-Control": f"public, max-age={STATIC_CACHE_MAX_AGE}, immutable",
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+        }
+
+        if _etag_matches(request_headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        if self.accel_redirect:
+            # Range/Content-Type 는 nginx 가 처리
+            rel_path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            headers["X-Accel-Redirect"] = self.accel_redirect + rel_path
+            return Response(status_code=status_code, headers=headers)
+
+        media_type = mimetypes.guess_type(str(full_path))[0] or "application/octet-stream"
+
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if range_header and (if_range is None or if_range == etag):
+            byte_range = _parse_range(range_header, size)
+
+            if byte_range is _UNSATISFIABLE:
+                headers["Content-Range"] = f"bytes */{size}"
+                return Response(status_code=416, headers=headers)
+
+            if byte_range is not None:
+                start, end = byte_range
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+                headers["Content-Length"] = str(end - start + 1)
+                if scope["method"] == "HEAD":
+                    return Response(status_code=206, headers=headers, media_type=media_type)
+                return StreamingResponse(
+                    _read_range(full_path, start, end),
+                    status_code=206,
+                    headers=headers,
+                    media_type=media_type,
+                )
+
+        # 여러 구간/형식 오류 Range 는 200 전체 응답 (Starlette 의 multipart/byteranges 로 가지 않게)
+        return _FullFileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,      # ETag 는 set_stat_headers 의 setdefault 보다 먼저 들어감
+            media_type=media_type,
+            stat_result=stat_result,     # HEAD 는 FileResponse 가 scope 에서 처리
+        )
+
+
+class _FullFileResponse(FileResponse):
+    """Range 헤더를 무시하는 FileResponse (구간 응답은 file_response 에서만)"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        headers = [(k, v) for k, v in scope["headers"] if k.lower() not in (b"range", b"if-range")]
+        await super().__call__({**scope, "headers": headers}, receive, send)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # 약한 비교 (If-None-Match 규칙): W/ 접두어 무시
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+_UNSATISFIABLE = object()
+
+
+def _parse_range(header: str, size: int):
+    """
+    단일 bytes 구간 → (start, end) / 범위 밖 → _UNSATISFIABLE / 지원 안 함·형식 오류 → None (전체 응답)
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+
+    try:
+        if first == "":
+            # bytes=-N → 마지막 N 바이트
+            length = int(last)
+            if length <= 0:
+                return _UNSATISFIABLE
+            return max(size - length, 0), size - 1
+
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or end < start:
+        return _UNSATISFIABLE
+    return start, min(end, size - 1)
+
+
+async def _read_range(path, start: int, end: int):
+    f = await run_in_threadpool(open, path, "rb")
+    try:
+        await run_in_threadpool(f.seek, start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await run_in_threadpool(f.read, min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await run_in_threadpool(f.close)
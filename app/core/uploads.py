@@ -0,0 +1,199 @@
+# app/core/uploads.py
+# 이미지 업로드 공통 파이프라인
+# - 청크 단위로 임시 파일에 스트리밍 (디스크 쓰기는 스레드풀, 요청당 메모리 일정)
+# - 크기 상한 초과 시 즉시 413 (본문 수신 단계는 UploadSizeLimitMiddleware, 파일 단위는 save_image_upload)
+# - 첫 청크의 매직 바이트로 실제 이미지 형식 확인 (클라이언트 MIME 만 믿지 않음)
+# - 저장 이름은 내용의 sha256 (같은 파일은 한 번만 저장, 참조 수는 app.crud.upload_crud)
+# - 같은 폴더의 임시 파일 → 최종 경로로 원자적 rename (rename 은 upload_crud.acquire_upload 에서)
+import os
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))   # 기본 10MB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# multipart 본문 전체 상한 = 이미지 상한 + 텍스트 필드/경계 문자열 여유분
+MAX_FORM_OVERHEAD_BYTES = int(os.getenv("MAX_FORM_OVERHEAD_BYTES", str(256 * 1024)))
+
+ALLOWED_EXT = {"jpg", "jpeg", "png", "gif", "webp"}
+ALLOWED_MIME = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+
+def _sniff_image_ext(head: bytes) -> str | None:
+    """파일 앞부분 매직 바이트로 이미지 형식 판별"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def _validate_image_meta(file: UploadFile) -> None:
+    ext = file.filename.rsplit(".", 1)[-1].lower()
+    if ext not in ALLOWED_EXT:
+        raise HTTPException(
+            status_code=400,
+            detail="허용되지 않은 이미지 형식입니다. (jpg, jpeg, png, gif, webp만 가능)",
+        )
+
+    if file.content_type not in ALLOWED_MIME:
+        raise HTTPException(status_code=400, detail="이미지 파일 형식이 올바르지 않습니다.")
+
+    # 크기를 미리 알 수 있으면 읽기 전에 거절
+    size = getattr(file, "size", None)
+    if size is not None and size > MAX_UPLOAD_BYTES:
+        raise _too_large()
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"이미지는 최대 {MAX_UPLOAD_BYTES // (1024 * 1024)}MB까지 업로드할 수 있습니다.",
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    multipart 요청 본문을 받는 단계에서 크기 제한 (폼 파싱/임시 파일 스풀 전에 413)
+    - Content-Length 가 상한을 넘으면 본문을 읽지 않고 바로 거절
+    - 길이를 모르거나(chunked) 속인 경우 receive 누적 바이트로 중단
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int | None = None) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes or MAX_UPLOAD_BYTES + MAX_FORM_OVERHEAD_BYTES
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            response = JSONResponse({"detail": _too_large().detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # 폼 파싱 중 HTTPException 은 FastAPI 가 그대로 413 으로 응답
+                    raise _too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+@dataclass
+class StagedUpload:
+    """임시 파일까지 저장된 업로드 (최종 경로 배치 전)"""
+    tmp_path: str
+    path: str        # 내용 주소 경로: {dest_dir}/{sha256}.{ext}
+    sha256: str
+    size: int
+
+    def discard(self) -> None:
+        _remove_file(self.tmp_path)
+
+
+def _write_chunk(tmp, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    tmp.write(chunk)
+
+
+async def save_image_upload(file: UploadFile, dest_dir: str) -> StagedUpload:
+    """업로드 이미지를 dest_dir 임시 파일로 저장하고 내용 해시 계산"""
+    _validate_image_meta(file)
+
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=".upload-", suffix=".tmp")
+    tmp = os.fdopen(fd, "wb")
+    digest = hashlib.sha256()
+
+    try:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        ext = _sniff_image_ext(chunk)
+        if ext is None:
+            raise HTTPException(status_code=400, detail="이미지 파일 형식이 올바르지 않습니다.")
+
+        written = 0
+        while chunk:
+            written += len(chunk)
+            if written > MAX_UPLOAD_BYTES:
+                raise _too_large()
+            await run_in_threadpool(_write_chunk, tmp, digest, chunk)
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+
+        await run_in_threadpool(tmp.close)
+
+        sha256 = digest.hexdigest()
+        return StagedUpload(
+            tmp_path=tmp_path,
+            path=os.path.join(dest_dir, f"{sha256}.{ext}"),
+            sha256=sha256,
+            size=written,
+        )
+
+    except BaseException:
+        tmp.close()
+        _remove_file(tmp_path)
+        raise
+
+
+# 파생 이미지 (app.core.images 에서 생성): 이름 → 최대 가로 폭(px)
+IMAGE_VARIANT_WIDTHS = {
+    "thumb": int(os.getenv("IMAGE_THUMB_WIDTH", "320")),     # 피드/프로필
+    "medium": int(os.getenv("IMAGE_MEDIUM_WIDTH", "960")),   # 상세
+}
+
+
+def variant_path(src_path: str, variant: str) -> str:
+    """파생 이미지 경로 규칙: {원본 stem}_{variant}.webp (원본과 같은 폴더)"""
+    stem, _ = os.path.splitext(src_path)
+    return f"{stem}_{variant}.webp"
+
+
+def _remove_file(path: str) -> None:
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def remove_image_variants(src_path: str) -> None:
+    """원본에서 파생된 이미지들만 삭제"""
+    for variant in IMAGE_VARIANT_WIDTHS:
+        _remove_file(variant_path(src_path, variant))
+
+
+def remove_upload(path: str | None) -> None:
+    """
+    저장된 업로드 파일 + 파생 이미지 삭제 (없거나 실패해도 무시)
+    - 여러 게시글/유저가 공유할 수 있으므로 직접 호출하지 말고 upload_crud.release_upload 사용
+    - 실제 삭제는 참조가 0이 된 뒤 GC(upload_crud.collect_unreferenced_uploads)에서
+    """
+    if not path:
+        return
+
+    _remove_file(path)
+    remove_image_variants(path)
@@ -0,0 +1,72 @@
+# app/counters.py
+# Redis 카운터 (write-behind)
+# - 조회수는 Redis HINCRBY 로만 올리고, 주기 작업(jobs.flush_view_counts)이 MySQL에 모아서 반영
+# - 화면에 보여줄 값 = DB 값 + 아직 반영 안 된 delta
+import uuid
+from redis.exceptions import RedisError, ResponseError
+
+from app.queue import redis
+
+
+# -----------------------------
+# 조회수
+# -----------------------------
+VIEWS_PENDING_KEY = "counter:views:pending"      # 새로 쌓이는 delta
+VIEWS_FLUSHING_KEY = "counter:views:flushing"    # flush 중인 delta (DB 반영 후 삭제)
+VIEWS_FLUSH_ID_FIELD = "flush_id"                # flushing 해시 안의 flush 토큰 (게시글 id 필드와 겹치지 않음)
+
+
+def record_view(post_id: int) -> int:
+    """조회수 +1 기록 후, 아직 DB에 반영되지 않은 delta 합계 반환"""
+    try:
+        pipe = redis.pipeline()
+        pipe.hincrby(VIEWS_PENDING_KEY, post_id, 1)
+        pipe.hget(VIEWS_FLUSHING_KEY, post_id)
+        pending, flushing = pipe.execute()
+    except RedisError:
+        return 0
+
+    return int(pending) + int(flushing or 0)
+
+
+def pending_views(post_ids: list[int]) -> dict[int, int]:
+    """여러 게시글의 미반영 조회수 delta (피드용)"""
+    if not post_ids:
+        return {}
+
+    try:
+        pipe = redis.pipeline()
+        pipe.hmget(VIEWS_PENDING_KEY, post_ids)
+        pipe.hmget(VIEWS_FLUSHING_KEY, post_ids)
+        pending, flushing = pipe.execute()
+    except RedisError:
+        return {}
+
+    return {
+        pid: int(p or 0) + int(f or 0)
+        for pid, p, f in zip(post_ids, pending, flushing)
+    }
+
+
+def take_view_deltas() -> tuple[str | None, dict[int, int]]:
+    """
+    flush 대상 (flush 토큰, delta) 가져오기
+    - pending → flushing 으로 RENAME (원자적, 이후 조회는 새 pending 에 쌓임)
+    - 이전 flush가 실패해서 flushing 이 남아 있으면 그것부터 처리 (같은 토큰 → DB에서 중복 반영 방지)
+    """
+    if not redis.exists(VIEWS_FLUSHING_KEY):
+        try:
+            redis.rename(VIEWS_PENDING_KEY, VIEWS_FLUSHING_KEY)
+        except ResponseError:
+            return None, {}   # pending 없음
+
+    # 토큰은 DB 반영 전에 한 번만 정해짐 (HSETNX)
+    redis.hsetnx(VIEWS_FLUSHING_KEY, VIEWS_FLUSH_ID_FIELD, str(uuid.uuid4()))
+    raw = redis.hgetall(VIEWS_FLUSHING_KEY)
+    flush_id = raw.pop(VIEWS_FLUSH_ID_FIELD)
+    return flush_id, {int(pid): int(n) for pid, n in raw.items() if int(n) > 0}
+
+
+def finish_view_flush() -> None:
+    """DB 커밋 후 호출 (이미 반영된 flush 였어도 호출)"""
+    redis.delete(VIEWS_FLUSHING_KEY)
@@ -0,0 +1,32 @@
+# app/crud/outbox_crud.py
+# 모더레이션 outbox (app.models.outbox_model.ModerationOutbox)
+from sqlalchemy.orm import Session
+
+from app.models.outbox_model import ModerationOutbox
+
+
+def add_moderation_outbox(db: Session, target_type: str, target_id: int) -> None:
+    """모더레이션 요청 기록 (commit 은 호출 측에서, 게시글/댓글 쓰기와 같은 트랜잭션으로)"""
+    db.add(ModerationOutbox(target_type=target_type, target_id=target_id))
+
+
+def take_moderation_outbox(db: Session, limit: int) -> list[ModerationOutbox]:
+    """
+    오래된 순으로 최대 limit 개 잠금 (relay 가 여러 개여도 SKIP LOCKED 로 나눠 가짐)
+    - 호출 측에서 Redis 반영 후 delete_moderation_outbox + commit
+    """
+    return (
+        db.query(ModerationOutbox)
+        .order_by(ModerationOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+
+def delete_moderation_outbox(db: Session, ids: list[int]) -> None:
+    (
+        db.query(ModerationOutbox)
+        .filter(ModerationOutbox.id.in_(ids))
+        .delete(synchronize_session=False)
+    )
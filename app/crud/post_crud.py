@@ -1,9 +1,19 @@
 from fastapi import HTTPException
+from sqlalchemy import Row, Select, case, func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import Session
 from typing import List
+from collections import defaultdict
+from datetime import datetime, timedelta
 
 
-from app.models.post_model import Post, Comment
+from app.database import as_async, is_lock_conflict
+from app.cache import invalidate_feed
+from app.crud.upload_crud import release_upload_refs
+from app.crud.outbox_crud import add_moderation_outbox
+from app.models.post_model import Post, Comment, PostLike, EXCERPT_LENGTH, KST
+from app.models.counter_model import ViewCountFlush
+from app.models.user_model import User
 
 
 # -----------------------------
@@ -11,30 +21,80 @@ from app.models.post_model import Post, Comment
 # -----------------------------
 def get_post_or_404(db: Session, post_id: int) -> Post:
     """id로 게시글 조회. 없으면 404"""
-    post = db.query(Post).filter(Post.id == post_id, Post.moderation_status != "HIDDEN").first()
+    post = db.query(Post).filter(Post.id == post_id, Post.visible == True).first()
     if post is None:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
     return post
 
 
-from sqlalchemy.orm import joinedload
+def ensure_post_visible(db: Session, post_id: int) -> None:
+    """노출 게시글 존재 확인만 (본문 등은 읽지 않음). 없으면 404"""
+    found = db.execute(select(Post.id).where(Post.id == post_id, Post.visible == True)).first()
+    if found is None:
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+
+
+def make_excerpt(content: str) -> str:
+    """피드용 요약: 공백 정리 후 EXCERPT_LENGTH 자 (넘으면 말줄임)"""
+    text = " ".join(content.split())
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    return text[:EXCERPT_LENGTH].rstrip() + "…"
+
+
+def _set_content(post: Post, content: str) -> None:
+    if post.content is not None and post.content != content:
+        post.content_version = Post.content_version + 1    # 진행 중인 판정은 반영되지 않도록
+    post.content = content
+    post.excerpt = make_excerpt(content)
+    post.content_length = len(content)
+
 
 def list_posts_cursor(
     db: Session,
     last_id: int | None,
     size: int,
-) -> List[Post]:
-    query = (
-        db.query(Post)
-        .options(joinedload(Post.user))   # 작성자 정보 함께 로딩
-        .filter(Post.moderation_status != "HIDDEN")  # 숨김 추가
+) -> List[Row]:
+    """피드 한 페이지 (ORM 엔티티 대신 필요한 컬럼만 row 로, content TEXT 는 읽지 않음)"""
+    return db.execute(list_posts_stmt(last_id, size)).all()
+
+
+def list_posts_stmt(last_id: int | None, size: int) -> Select:
+    """피드 keyset 쿼리 (scripts/explain_keyset_queries.py 도 같은 쿼리로 인덱스 확인)"""
+    stmt = (
+        select(
+            Post.id, Post.title, Post.excerpt, Post.content_length, Post.has_image,
+            Post.image_path, Post.image_thumb_path,
+            Post.likes, Post.views, Post.comment_count, Post.created_at, Post.user_id,
+            User.nickname.label("user_nickname"),
+        )
+        .outerjoin(User, User.id == Post.user_id)
+        .where(Post.visible == True)     # 숨김 제외 (ix_posts_visible_id)
         .order_by(Post.id.desc())
+        .limit(size)
     )
 
     if last_id is not None:
-        query = query.filter(Post.id < last_id)
+        stmt = stmt.where(Post.id < last_id)
+
+    return stmt
+
 
-    return query.limit(size).all()
+def get_post_detail_row(db: Session, post_id: int) -> Row:
+    """상세 조회용 row (작성자 닉네임 포함). 없으면 404"""
+    stmt = (
+        select(
+            Post.id, Post.title, Post.content, Post.image_path, Post.image_medium_path,
+            Post.likes, Post.views, Post.comment_count, Post.created_at, Post.user_id,
+            User.nickname.label("user_nickname"),
+        )
+        .outerjoin(User, User.id == Post.user_id)
+        .where(Post.id == post_id, Post.visible == True)
+    )
+    row = db.execute(stmt).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+    return row
 
 
 def create_post(
@@ -47,46 +107,112 @@ def create_post(
     """게시글 생성 후 DB 저장"""
     new_post = Post(
         title=title,
-        content=content,
         image_path=image_path,
+        has_image=image_path is not None,
         likes=0,
         views=0,
         user_id=user_id,   # FK 저장
     )
+    _set_content(new_post, content)
     db.add(new_post)
+    db.flush()                                        # id 확보
+    add_moderation_outbox(db, "post", new_post.id)    # 같은 트랜잭션
     db.commit()
     db.refresh(new_post)
     return new_post
 
 
-def increase_views(db: Session, post_id: int) -> Post:
-    """조회수 +1 후 게시글 반환"""
-    post = get_post_or_404(db, post_id)
-    post.views += 1
-    db.commit()
-    db.refresh(post)
-    return post
+VIEW_FLUSH_RETENTION = timedelta(days=1)    # flush 토큰 보관 기간 (재시도는 이보다 훨씬 짧음)
 
 
-def toggle_like(db: Session, post_id: int, liked_now: bool) -> Post:
+def add_post_views(db: Session, deltas: dict[int, int], flush_id: str) -> bool:
+    """
+    조회수 delta 일괄 반영 (app.jobs.flush_view_counts 에서 호출)
+    - 같은 delta 끼리 묶어서 UPDATE posts SET views = views + n WHERE id IN (...)
+    - flush_id 를 같은 트랜잭션에 기록 → 이미 반영된 flush 면 아무것도 하지 않고 False
     """
-    좋아요 토글 후 게시글 반환
+    db.add(ViewCountFlush(flush_id=flush_id))
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        return False
+
+    ids_by_delta: dict[int, list[int]] = defaultdict(list)
+    for post_id, n in deltas.items():
+        ids_by_delta[n].append(post_id)
+
+    for n, ids in ids_by_delta.items():
+        for i in range(0, len(ids), 500):
+            (
+                db.query(Post)
+                .filter(Post.id.in_(ids[i:i + 500]))
+                .update({Post.views: Post.views + n}, synchronize_session=False)
+            )
+
+    # 오래된 토큰 정리
+    (
+        db.query(ViewCountFlush)
+        .filter(ViewCountFlush.applied_at < datetime.now(KST) - VIEW_FLUSH_RETENTION)
+        .delete(synchronize_session=False)
+    )
 
-    liked_now:
-      - False → 지금 막 좋아요 누른 상황 → +1
-      - True  → 좋아요 해제 → -1 (0 밑으로는 안내려감)
+    db.commit()
+    return True
+
+
+def like_post(db: Session, post_id: int, user_id: int) -> int:
     """
-    post = get_post_or_404(db, post_id)
+    좋아요 (멱등) 후 현재 좋아요 수 반환
+    - 원장(post_likes)에 새로 들어간 경우에만 likes = likes + 1 (SQL 원자 증가)
+    """
+    get_post_or_404(db, post_id)
+
+    try:
+        with db.begin_nested():
+            db.add(PostLike(user_id=user_id, post_id=post_id))
+        added = True
+    except IntegrityError:
+        added = False   # 이미 좋아요 한 상태
+
+    if added:
+        (
+            db.query(Post)
+            .filter(Post.id == post_id)
+            .update({Post.likes: Post.likes + 1}, synchronize_session=False)
+        )
+    db.commit()
 
-    if not liked_now:
-        post.likes += 1
-    else:
-        if post.likes > 0:
-            post.likes -= 1
+    return get_like_count(db, post_id)
+
+
+def unlike_post(db: Session, post_id: int, user_id: int) -> int:
+    """좋아요 취소 (멱등) 후 현재 좋아요 수 반환"""
+    get_post_or_404(db, post_id)
 
+    deleted = (
+        db.query(PostLike)
+        .filter(PostLike.user_id == user_id, PostLike.post_id == post_id)
+        .delete(synchronize_session=False)
+    )
+    if deleted:
+        (
+            db.query(Post)
+            .filter(Post.id == post_id, Post.likes > 0)
+            .update({Post.likes: Post.likes - 1}, synchronize_session=False)
+        )
     db.commit()
-    db.refresh(post)
-    return post
+
+    return get_like_count(db, post_id)
+
+
+def get_like_count(db: Session, post_id: int) -> int:
+    return db.query(Post.likes).filter(Post.id == post_id).scalar() or 0
+
+
+def has_liked(db: Session, post_id: int, user_id: int) -> bool:
+    """해당 유저가 좋아요 눌렀는지 (PK 조회)"""
+    return db.get(PostLike, (user_id, post_id)) is not None
 
 
 def update_post(
@@ -108,15 +234,44 @@ def update_post(
         raise HTTPException(status_code=403, detail="본인이 작성한 게시글만 수정할 수 있습니다.")
 
     post.title = title
-    post.content = content
+    _set_content(post, content)
     if new_image_path is not None:
+        release_upload_refs(db, [post.image_path])    # 기존 이미지 참조 해제 (같은 트랜잭션)
         post.image_path = new_image_path
+        post.has_image = True
+        # 파생 이미지는 새 원본 기준으로 다시 생성 (그 전까지는 원본 사용)
+        post.image_thumb_path = None
+        post.image_medium_path = None
 
+    add_moderation_outbox(db, "post", post.id)
     db.commit()
     db.refresh(post)
     return post
 
 
+def set_post_image_variants(
+    db: Session,
+    post_id: int,
+    src_path: str,
+    thumb_path: str | None,
+    medium_path: str | None,
+) -> bool:
+    """
+    파생 이미지 경로 기록 (images 워커)
+    - 그 사이 이미지가 바뀌었으면(image_path != src_path) 갱신하지 않고 False
+    """
+    updated = (
+        db.query(Post)
+        .filter(Post.id == post_id, Post.image_path == src_path)
+        .update(
+            {Post.image_thumb_path: thumb_path, Post.image_medium_path: medium_path},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return updated > 0
+
+
 def delete_post(db: Session, post_id: int) -> Post:
     """
     게시글 삭제 후 삭제된 Post 반환
@@ -127,6 +282,7 @@ def delete_post(db: Session, post_id: int) -> Post:
     """
     post = get_post_or_404(db, post_id)  # 없으면 404
 
+    release_upload_refs(db, [post.image_path])
     db.delete(post)
     db.commit()
     return post
@@ -155,6 +311,9 @@ def add_comment(
         content=content,
     )
     db.add(comment)
+    _add_comment_count(db, post.id, 1)    # 새 댓글은 노출 상태
+    db.flush()
+    add_moderation_outbox(db, "comment", comment.id)
     db.commit()
     db.refresh(post)
     db.refresh(comment)
@@ -165,6 +324,41 @@ def add_comment(
     }
 
 
+def list_comments_cursor(
+    db: Session,
+    post_id: int,
+    after: tuple[datetime, int] | None,
+    size: int,
+) -> List[Row]:
+    """
+    노출 댓글 keyset 페이지 (created_at, id 오름차순, 응답에 필요한 컬럼만 row 로)
+    - after: 직전 페이지 마지막 댓글의 (created_at, id)
+    """
+    return db.execute(list_comments_stmt(post_id, after, size)).all()
+
+
+def list_comments_stmt(post_id: int, after: tuple[datetime, int] | None, size: int) -> Select:
+    """댓글 keyset 쿼리 (ix_comments_post_visible_created_id 로 range scan)"""
+    stmt = (
+        select(
+            Comment.id, Comment.post_id, Comment.content, Comment.writer,
+            Comment.user_id, Comment.created_at,
+        )
+        .where(Comment.post_id == post_id, Comment.visible == True)
+        .order_by(Comment.created_at.asc(), Comment.id.asc())
+        .limit(size)
+    )
+
+    if after is not None:
+        created_at, comment_id = after
+        stmt = stmt.where(
+            (Comment.created_at > created_at)
+            | ((Comment.created_at == created_at) & (Comment.id > comment_id))
+        )
+
+    return stmt
+
+
 def update_comment(
     db: Session,
     post_id: int,
@@ -185,7 +379,10 @@ def update_comment(
     if comment.user_id != user_id:
         raise HTTPException(status_code=403, detail="본인이 작성한 댓글만 수정할 수 있습니다.")
 
+    if comment.content != content:
+        comment.content_version = Comment.content_version + 1   # 진행 중인 판정은 반영되지 않도록
     comment.content = content
+    add_moderation_outbox(db, "comment", comment.id)
     db.commit()
     db.refresh(comment)
     return comment
@@ -209,21 +406,74 @@ def delete_comment(
     if comment.user_id != user_id:
         raise HTTPException(status_code=403, detail="본인이 작성한 댓글만 삭제할 수 있습니다.")
 
+    if comment.visible:
+        _add_comment_count(db, post_id, -1)
     db.delete(comment)
     db.commit()
 
-    remaining = (
-        db.query(Comment)
-        .filter(
-            Comment.post_id == post_id,
-            Comment.moderation_status != "HIDDEN",  # 숨김 제외
-        )
-        .count()
+    # 남은 댓글 수 = 비정규화 컬럼 (COUNT 쿼리 없음)
+    remaining = db.query(Post.comment_count).filter(Post.id == post_id).scalar()
+
+    return remaining or 0
+
+
+def _add_comment_count(db: Session, post_id: int, delta: int) -> None:
+    """posts.comment_count 원자 증감 (커밋은 호출한 쪽 트랜잭션에서)"""
+    query = db.query(Post).filter(Post.id == post_id)
+    if delta < 0:
+        query = query.filter(Post.comment_count > 0)
+    query.update({Post.comment_count: Post.comment_count + delta}, synchronize_session=False)
+
+
+def repair_comment_counts(db: Session, batch_size: int = 1000) -> int:
+    """
+    comment_count 드리프트 일괄 보정 (app.jobs.repair_comment_counts)
+    - id 구간별로 실제 노출 댓글 수와 다른 행만 UPDATE
+    - 보정한 게시글 수 반환
+    """
+    max_id = db.query(func.max(Post.id)).scalar() or 0
+    visible_count = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id, Comment.visible == True)
+        .scalar_subquery()
     )
 
-    return remaining
+    fixed = 0
+    for lo in range(0, max_id + 1, batch_size):
+        fixed += (
+            db.query(Post)
+            .filter(
+                Post.id >= lo,
+                Post.id < lo + batch_size,
+                Post.comment_count != visible_count,
+            )
+            .update({Post.comment_count: visible_count}, synchronize_session=False)
+        )
+        db.commit()
 
+    return fixed
+
+
+
+
+def load_moderation_targets(
+    db: Session,
+    targets: list[tuple[str, int]],
+) -> dict[tuple[str, int], tuple[str, int]]:
+    """모더레이션 대상의 현재 (본문, content_version). 삭제된 대상은 빠짐"""
+    found: dict[tuple[str, int], tuple[str, int]] = {}
+
+    for target_type, model in (("post", Post), ("comment", Comment)):
+        ids = [target_id for t, target_id in targets if t == target_type]
+        if not ids:
+            continue
+        rows = db.execute(
+            select(model.id, model.content, model.content_version).where(model.id.in_(ids))
+        )
+        for target_id, content, version in rows:
+            found[(target_type, target_id)] = (content, version)
 
+    return found
 
 
 def apply_moderation_result(
@@ -232,29 +482,218 @@ def apply_moderation_result(
     target_id: int,     # post_id or comment_id
     action: str,
     reason: str | None,
+    content_version: int | None = None,   # 판정한 본문 버전 (다르면 이미 수정된 것 → 무시)
 ) -> None:
     t = (target_type or "").strip().lower()
-    a = (action or "").strip().lower()
 
+    # 행 잠금: 버전 확인 ~ 반영 사이에 수정이 끼어들지 않도록
     if t == "post":
-        obj = db.query(Post).filter(Post.id == target_id).first()
+        obj = db.query(Post).filter(Post.id == target_id).with_for_update().first()
     elif t == "comment":
-        obj = db.query(Comment).filter(Comment.id == target_id).first()
+        obj = db.query(Comment).filter(Comment.id == target_id).with_for_update().first()
     else:
         return
 
     if obj is None:
         return
 
-    if a == "safe":
-        obj.moderation_status = "SAFE"
-        obj.moderation_reason = None
-    elif a == "hidden":
-        obj.moderation_status = "HIDDEN"
-        obj.moderation_reason = reason
-    else:
-        obj.moderation_status = "REVIEW"
-        obj.moderation_reason = reason or f"unknown action: {action}"
+    # 판정 중에 다시 수정됨 → 최신 본문은 다음 판정에서 (debounce 집합에 이미 예약됨)
+    if content_version is not None and obj.content_version != content_version:
+        return
+
+    was_visible = obj.visible
+
+    obj.moderation_status, obj.moderation_reason = _moderation_status(action, reason)
+    obj.visible = obj.moderation_status != "HIDDEN"
+
+    # 댓글이 숨김/숨김 해제되면 게시글의 댓글 수도 같은 트랜잭션에서 조정
+    if t == "comment" and was_visible != obj.visible:
+        _add_comment_count(db, obj.post_id, 1 if obj.visible else -1)
 
     db.commit()
 
+    # 게시글이 숨김/숨김 해제되면 피드 캐시 무효화
+    if t == "post" and was_visible != obj.visible:
+        invalidate_feed()
+
+
+def _moderation_status(action: str, reason: str | None) -> tuple[str, str | None]:
+    """agent action → (moderation_status, moderation_reason)"""
+    a = (action or "").strip().lower()
+    if a == "safe":
+        return "SAFE", None
+    if a == "hidden":
+        return "HIDDEN", reason
+    return "REVIEW", reason or f"unknown action: {action}"
+
+
+MODERATION_BULK_CHUNK = 500         # 트랜잭션 하나에서 잠그는 대상 수
+MODERATION_BULK_RETRIES = 3         # 데드락/잠금 대기 초과 시 청크 재시도 횟수
+
+
+def apply_moderation_results_bulk(db: Session, results: list[dict]) -> list[str]:
+    """
+    판정 결과 일괄 반영 (POST /internal/moderation-results). 항목별 결과 반환
+      applied   : 반영
+      not_found : 대상 없음 (삭제됨)
+      stale     : content_version 이 달라 무시 (판정 이후 수정됨)
+      duplicate : 같은 요청 안에 같은 대상의 뒤 항목이 있어 무시 (마지막 항목 기준)
+    - MODERATION_BULK_CHUNK 개 대상씩 청크마다 한 트랜잭션 (잠금 유지 시간 제한)
+    - 잠금 순서는 단건 apply_moderation_result 와 같게 댓글 → 게시글 (각각 id 순)
+      데드락/잠금 대기 초과면 그 청크만 롤백 후 재시도
+    - (타입, 상태)별 UPDATE ... WHERE id IN (...) (사유는 CASE), 댓글 수는 delta 별 UPDATE
+    """
+    outcomes = ["applied"] * len(results)
+
+    # 같은 대상은 마지막 항목만
+    last_index: dict[tuple[str, int], int] = {}
+    for i, r in enumerate(results):
+        key = (r["target_type"], int(r["target_id"]))
+        if key in last_index:
+            outcomes[last_index[key]] = "duplicate"
+        last_index[key] = i
+
+    targets = list(last_index.items())
+    posts_visibility_changed = False
+    try:
+        for c in range(0, len(targets), MODERATION_BULK_CHUNK):
+            chunk = dict(targets[c:c + MODERATION_BULK_CHUNK])
+            for attempt in range(MODERATION_BULK_RETRIES + 1):
+                try:
+                    chunk_outcomes, changed = _apply_moderation_chunk(db, results, chunk)
+                    db.commit()
+                    break
+                except OperationalError as e:
+                    db.rollback()
+                    if attempt == MODERATION_BULK_RETRIES or not is_lock_conflict(e):
+                        raise
+
+            for i, outcome in chunk_outcomes.items():
+                outcomes[i] = outcome
+            posts_visibility_changed = posts_visibility_changed or changed
+    finally:
+        # 앞 청크가 이미 커밋됐으면 뒤 청크가 실패해도 무효화
+        if posts_visibility_changed:
+            invalidate_feed()
+
+    return outcomes
+
+
+def _apply_moderation_chunk(
+    db: Session,
+    results: list[dict],
+    chunk: dict[tuple[str, int], int],
+) -> tuple[dict[int, str], bool]:
+    """청크 하나 반영 (커밋은 호출한 쪽). (항목 index → 결과, 게시글 노출 변경 여부) 반환"""
+    outcomes: dict[int, str] = {}
+    comment_index = {target_id: i for (t, target_id), i in chunk.items() if t == "comment"}
+    post_index = {target_id: i for (t, target_id), i in chunk.items() if t == "post"}
+
+    # 1) 댓글 잠금 (id 순)
+    comments = {}
+    if comment_index:
+        rows = db.execute(
+            select(Comment.id, Comment.visible, Comment.content_version, Comment.post_id)
+            .where(Comment.id.in_(sorted(comment_index)))
+            .order_by(Comment.id)
+            .with_for_update()
+        )
+        comments = {row.id: row for row in rows}
+    comment_statuses, comment_flipped = _judge_moderation_targets(results, comment_index, comments, outcomes)
+
+    comment_count_deltas: dict[int, int] = defaultdict(int)
+    for comment_id, visible in comment_flipped.items():
+        comment_count_deltas[comments[comment_id].post_id] += 1 if visible else -1
+
+    # 2) 게시글 잠금 (판정 대상 + 댓글 수가 바뀔 게시글, id 순)
+    post_ids = sorted(set(post_index) | {post_id for post_id, d in comment_count_deltas.items() if d})
+    posts = {}
+    if post_ids:
+        rows = db.execute(
+            select(Post.id, Post.visible, Post.content_version)
+            .where(Post.id.in_(post_ids))
+            .order_by(Post.id)
+            .with_for_update()
+        )
+        posts = {row.id: row for row in rows}
+    post_statuses, post_flipped = _judge_moderation_targets(results, post_index, posts, outcomes)
+
+    # 3) 상태별 set-based UPDATE
+    _update_moderation_statuses(db, Comment, comment_statuses)
+    _update_moderation_statuses(db, Post, post_statuses)
+
+    # 4) 숨김/해제된 댓글만큼 게시글 댓글 수 조정 (같은 delta 끼리 묶어서, 0 아래로는 안 내려감 - CASE 로 DB 무관)
+    ids_by_delta: dict[int, list[int]] = defaultdict(list)
+    for post_id, delta in comment_count_deltas.items():
+        if delta:
+            ids_by_delta[delta].append(post_id)
+    for delta, delta_post_ids in ids_by_delta.items():
+        new_count = Post.comment_count + delta
+        if delta < 0:
+            new_count = case((Post.comment_count > -delta, new_count), else_=0)
+        (
+            db.query(Post)
+            .filter(Post.id.in_(delta_post_ids))
+            .update({Post.comment_count: new_count}, synchronize_session=False)
+        )
+
+    return outcomes, bool(post_flipped)
+
+
+def _judge_moderation_targets(
+    results: list[dict],
+    index_by_id: dict[int, int],
+    current: dict[int, Row],
+    outcomes: dict[int, str],
+) -> tuple[dict[str, dict[int, str | None]], dict[int, bool]]:
+    """항목별 판단 → ({상태: {id: 사유}}, {노출 여부가 바뀌는 id: 새 visible})"""
+    by_status: dict[str, dict[int, str | None]] = defaultdict(dict)
+    flipped: dict[int, bool] = {}
+
+    for target_id, i in index_by_id.items():
+        row = current.get(target_id)
+        if row is None:
+            outcomes[i] = "not_found"
+            continue
+
+        r = results[i]
+        if r.get("content_version") is not None and r["content_version"] != row.content_version:
+            outcomes[i] = "stale"
+            continue
+
+        status, status_reason = _moderation_status(r["action"], r.get("reason"))
+        by_status[status][target_id] = status_reason
+        outcomes[i] = "applied"
+
+        visible = status != "HIDDEN"
+        if row.visible != visible:
+            flipped[target_id] = visible
+
+    return by_status, flipped
+
+
+def _update_moderation_statuses(db: Session, model, by_status: dict[str, dict[int, str | None]]) -> None:
+    for status, reasons in by_status.items():
+        if any(v is not None for v in reasons.values()):
+            reason_expr = case(reasons, value=model.id, else_=None)
+        else:
+            reason_expr = None      # SAFE 등 사유 없는 그룹은 CASE 생략
+        (
+            db.query(model)
+            .filter(model.id.in_(list(reasons)))
+            .update(
+                {
+                    model.moderation_status: status,
+                    model.moderation_reason: reason_expr,
+                    model.visible: status != "HIDDEN",
+                },
+                synchronize_session=False,
+            )
+        )
+
+
+# -----------------------------
+# 비동기 버전 (async 라우트용, app.database.as_async)
+# -----------------------------
+create_post_async = as_async(create_post)
+update_post_async = as_async(update_post)
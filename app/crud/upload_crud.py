@@ -0,0 +1,126 @@
+# app/crud/upload_crud.py
+# 업로드 파일 참조 수 관리 (app.models.upload_model.UploadBlob)
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.database import as_async, is_lock_conflict
+from app.core.uploads import StagedUpload, remove_upload
+from app.models.post_model import KST
+from app.models.upload_model import UploadBlob
+
+
+ACQUIRE_RETRIES = 3    # 데드락/잠금 대기 초과 시 재시도 횟수
+
+
+def _upsert_blob_ref(db: Session, staged: StagedUpload) -> None:
+    """참조 +1 (없으면 ref_count=1 로 생성) 을 한 문장으로 → 같은 내용 동시 업로드도 잠금 경합 없이 합쳐짐"""
+    now = datetime.now(KST)
+    values = dict(path=staged.path, sha256=staged.sha256, size=staged.size, ref_count=1, updated_at=now)
+    bump = dict(ref_count=UploadBlob.ref_count + 1, updated_at=now)
+
+    if db.get_bind().dialect.name == "mysql":
+        stmt = mysql_insert(UploadBlob).values(**values).on_duplicate_key_update(**bump)
+    else:   # sqlite (로컬 테스트)
+        stmt = sqlite_insert(UploadBlob).values(**values).on_conflict_do_update(
+            index_elements=[UploadBlob.path], set_=bump,
+        )
+    db.execute(stmt)
+
+
+def acquire_upload(db: Session, staged: StagedUpload) -> str:
+    """
+    업로드 참조 +1 (처음 보는 내용이면 행 생성) 후 최종 경로 반환
+    - 같은 내용이 이미 있으면 임시 파일은 버리고 기존 파일 공유
+    - upsert 가 잡은 행 잠금을 가진 상태에서 파일 배치 → GC 와 겹쳐도 파일 없는 참조가 남지 않음
+    """
+    for attempt in range(ACQUIRE_RETRIES + 1):
+        try:
+            _upsert_blob_ref(db, staged)
+
+            if os.path.exists(staged.path):
+                staged.discard()
+            else:
+                os.replace(staged.tmp_path, staged.path)
+
+            db.commit()
+            return staged.path
+        except OperationalError as e:
+            db.rollback()
+            if attempt < ACQUIRE_RETRIES and is_lock_conflict(e):
+                continue
+            staged.discard()
+            raise
+        except BaseException:
+            db.rollback()
+            staged.discard()
+            raise
+
+
+def release_upload_refs(db: Session, paths: list[str | None]) -> None:
+    """
+    참조 -1 (commit 은 호출 측에서, 게시글/유저 변경과 같은 트랜잭션으로)
+    - 같은 경로가 여러 번 나오면 한 번에 n 감소
+    """
+    counts = Counter(p for p in paths if p)
+    for path, n in counts.items():
+        (
+            db.query(UploadBlob)
+            .filter(UploadBlob.path == path, UploadBlob.ref_count >= n)
+            .update(
+                {UploadBlob.ref_count: UploadBlob.ref_count - n, UploadBlob.updated_at: datetime.now(KST)},
+                synchronize_session=False,
+            )
+        )
+
+
+def release_upload(db: Session, path: str | None) -> None:
+    """참조 -1 후 commit (DB 저장 실패 시 방금 acquire 한 업로드 되돌리기용)"""
+    if not path:
+        return
+    db.rollback()    # 실패한 트랜잭션 정리 후 별도 트랜잭션으로
+    release_upload_refs(db, [path])
+    db.commit()
+
+
+def collect_unreferenced_uploads(db: Session, grace_sec: int, batch_size: int = 500) -> int:
+    """
+    참조 0 + 유예 시간 지난 파일 삭제 (app.jobs.collect_upload_garbage 에서 호출). 삭제한 수 반환
+    - 파일 삭제는 행 잠금 중에 → 같은 내용 재업로드(acquire_upload)는 commit 까지 대기 후 파일을 새로 배치
+    """
+    cutoff = datetime.now(KST) - timedelta(seconds=grace_sec)
+    removed = 0
+
+    while True:
+        blobs = (
+            db.query(UploadBlob)
+            .filter(UploadBlob.ref_count == 0, UploadBlob.updated_at < cutoff)
+            .order_by(UploadBlob.updated_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not blobs:
+            break
+
+        for blob in blobs:
+            remove_upload(blob.path)
+            db.delete(blob)
+        db.commit()
+
+        removed += len(blobs)
+        if len(blobs) < batch_size:
+            break
+
+    return removed
+
+
+# -----------------------------
+# 비동기 버전 (async 라우트용, app.database.as_async)
+# -----------------------------
+acquire_upload_async = as_async(acquire_upload)
+release_upload_async = as_async(release_upload)
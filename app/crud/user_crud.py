@@ -1,6 +1,10 @@
 # app/crud/user_crud.py
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
+from app.database import as_async
 from app.models.user_model import User  # ORM 모델
+from app.models.post_model import Post, Comment, PostLike
+from app.crud.upload_crud import release_upload_refs
 
 
 def create_user(
@@ -46,7 +50,41 @@ def is_nickname_duplicated(
 
 
 def delete_user(db: Session, user: User) -> User:
-    """User 객체를 받아서 삭제"""
+    """
+    User 객체를 받아서 삭제 (게시글/좋아요는 FK CASCADE, 이미지 참조는 여기서 해제)
+    - CASCADE 로 지워질 좋아요 / 노출 댓글만큼 다른 게시글의 posts.likes / comment_count 를
+      같은 트랜잭션에서 차감
+    """
+    liked_posts = db.query(PostLike.post_id).filter(PostLike.user_id == user.id)
+    (
+        db.query(Post)
+        .filter(Post.id.in_(liked_posts.scalar_subquery()), Post.likes > 0)
+        .update({Post.likes: Post.likes - 1}, synchronize_session=False)
+    )
+
+    comment_counts = (
+        db.query(Comment.post_id, func.count(Comment.id))
+        .filter(Comment.user_id == user.id, Comment.visible == True)
+        .group_by(Comment.post_id)
+        .all()
+    )
+    for post_id, n in comment_counts:
+        (
+            db.query(Post)
+            .filter(Post.id == post_id)
+            .update(
+                # 0 아래로는 안 내려가게 (CASE: SQLite 에도 있는 표현)
+                {Post.comment_count: case((Post.comment_count > n, Post.comment_count - n), else_=0)},
+                synchronize_session=False,
+            )
+        )
+
+    post_images = [
+        path for (path,) in
+        db.query(Post.image_path).filter(Post.user_id == user.id, Post.image_path.isnot(None))
+    ]
+    release_upload_refs(db, [user.profile_image_path, *post_images])
+
     db.delete(user)
     db.commit()
     return user
@@ -73,8 +111,37 @@ def update_user_profile(
     """닉네임 / 프로필 이미지 경로 수정"""
     user.nickname = nickname
     if profile_image_path is not None:
+        release_upload_refs(db, [user.profile_image_path])
         user.profile_image_path = profile_image_path
+        user.profile_thumb_path = None    # 새 원본 기준으로 다시 생성
 
     db.commit()
     db.refresh(user)
     return user
+
+
+def set_user_image_variants(
+    db: Session,
+    user_id: int,
+    src_path: str,
+    thumb_path: str | None,
+) -> bool:
+    """프로필 썸네일 경로 기록 (그 사이 프로필 이미지가 바뀌었으면 False)"""
+    updated = (
+        db.query(User)
+        .filter(User.id == user_id, User.profile_image_path == src_path)
+        .update({User.profile_thumb_path: thumb_path}, synchronize_session=False)
+    )
+    db.commit()
+    return updated > 0
+
+
+# -----------------------------
+# 비동기 버전 (async 라우트용, app.database.as_async)
+# -----------------------------
+create_user_async = as_async(create_user)
+get_user_by_email_async = as_async(get_user_by_email)
+get_user_by_id_async = as_async(get_user_by_id)
+is_nickname_duplicated_async = as_async(is_nickname_duplicated)
+update_user_password_async = as_async(update_user_password)
+update_user_profile_async = as_async(update_user_profile)
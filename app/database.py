@@ -1,16 +1,58 @@
 import os
-from sqlalchemy import create_engine
+import time
+import functools
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 
+from app.metrics import DB_POOL_CHECKOUT_WAIT, bind_db_pool_gauges
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=True,
-)
+# 커넥션 풀 설정 (환경변수로 조정)
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"            # SQL 로그 (기본 off)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))                   # 상시 유지 커넥션 수
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))             # 초과 허용 커넥션 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))           # checkout 대기 한도 (초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))           # MySQL wait_timeout 보다 짧게
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+
+def _timed_pool_class(label: str) -> type[QueuePool]:
+    """checkout 대기 시간을 Prometheus에 기록하는 QueuePool (engine 라벨별)"""
+
+    class TimedQueuePool(QueuePool):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                DB_POOL_CHECKOUT_WAIT.labels(engine=label).observe(time.perf_counter() - start)
+
+    return TimedQueuePool
+
+
+def _create_pooled_engine(url: str, label: str):
+    pooled_engine = create_engine(
+        url,
+        echo=DB_ECHO,
+        poolclass=_timed_pool_class(label),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    bind_db_pool_gauges(label, pooled_engine)
+    return pooled_engine
+
+
+engine = _create_pooled_engine(DATABASE_URL, "primary")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -21,3 +63,118 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def warm_up_pool(target_engine, count: int) -> int:
+    """커넥션 count개를 미리 열어 풀에 반납 (첫 요청의 TCP/인증 비용 제거). 연 개수 반환"""
+    count = min(count, DB_POOL_SIZE)
+    conns = []
+    try:
+        for _ in range(count):
+            conn = target_engine.connect()
+            conn.execute(text("SELECT 1"))
+            conns.append(conn)
+    finally:
+        for conn in conns:
+            conn.close()
+    return len(conns)
+
+
+# MySQL: lock wait timeout / deadlock → 트랜잭션을 처음부터 다시 하면 되는 오류
+LOCK_CONFLICT_ERRNOS = {1205, 1213}
+
+
+def is_lock_conflict(e: OperationalError) -> bool:
+    args = getattr(e.orig, "args", ())
+    return bool(args) and args[0] in LOCK_CONFLICT_ERRNOS
+
+
+# -----------------------------
+# 읽기 전용 복제본 (READ_DATABASE_URL 없으면 primary 재사용)
+# -----------------------------
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+read_engine = (
+    _create_pooled_engine(READ_DATABASE_URL, "replica")
+    if READ_DATABASE_URL
+    else engine
+)
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+# -----------------------------
+# 비동기 엔진 (DB_ASYNC=true 일 때만 생성)
+# - MySQL: mysql+aiomysql, 로컬 테스트: sqlite+aiosqlite
+# -----------------------------
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+
+def _to_async_url(url: str | None) -> str | None:
+    """동기 드라이버 URL → 비동기 드라이버 URL"""
+    if not url:
+        return url
+    if url.startswith("mysql+pymysql://") or url.startswith("mysql://"):
+        return "mysql+aiomysql://" + url.split("://", 1)[1]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DATABASE_URL)
+
+AsyncSession = None
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=DB_ECHO,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    bind_db_pool_gauges("async", async_engine.sync_engine)
+
+    # commit 후 속성 접근 시 lazy IO가 일어나지 않도록 expire_on_commit=False
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """
+    async 라우트용 세션
+    - DB_ASYNC=true → AsyncSession
+    - 아니면 기존 Session (CRUD 호출은 run_db 로 스레드풀에서 실행)
+    """
+    if AsyncSessionLocal is None:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """동기 CRUD 함수를 이벤트 루프를 막지 않고 실행"""
+    if AsyncSession is not None and isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def as_async(fn):
+    """동기 CRUD 함수 → async 버전 (첫 인자는 Session 또는 AsyncSession)"""
+
+    @functools.wraps(fn)
+    async def wrapper(db, *args, **kwargs):
+        return await run_db(db, fn, *args, **kwargs)
+
+    return wrapper
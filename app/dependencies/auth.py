@@ -1,19 +1,32 @@
+from dataclasses import dataclass, asdict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer  
 from sqlalchemy.orm import Session
 from jose import JWTError
 
+from app.cache import get_cached_user, set_cached_user
 from app.core.security import decode_access_token
 from app.database import get_db
+from app.dependencies.db import get_read_db
 from app.models.user_model import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")  
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    인증된 유저 정보 (ORM 엔티티 아님, 캐시 가능)
+    - 비밀번호 해시는 담지 않음 → 필요한 컨트롤러에서 id로 다시 조회
+    """
+    id: int
+    email: str
+    nickname: str
+    profile_image_path: str | None
+    profile_thumb_path: str | None = None   # 기본값: 컬럼 추가 전에 캐시된 값도 그대로 로드
+
+
+def _load_current_user(token: str, db: Session) -> CurrentUser:
 
     try:
         payload = decode_access_token(token)  # ← 여기서 exp + signature 검증
@@ -31,6 +44,12 @@ def get_current_user(
             detail="토큰에 포함된 사용자 정보 없음",
         )
 
+    # 1) 캐시 (hit이면 DB 조회 없음)
+    cached = get_cached_user(int(user_id))
+    if cached is not None:
+        return CurrentUser(**cached)
+
+    # 2) DB
     user = db.query(User).filter(User.id == int(user_id)).first()
     if not user:
         raise HTTPException(
@@ -38,4 +57,29 @@ def get_current_user(
             detail="사용자를 찾을 수 없음",
         )
 
-    return user
+    principal = CurrentUser(
+        id=user.id,
+        email=user.email,
+        nickname=user.nickname,
+        profile_image_path=user.profile_image_path,
+        profile_thumb_path=user.profile_thumb_path,
+    )
+    set_cached_user(principal.id, asdict(principal))
+
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    """쓰기 라우트용: 캐시 miss 시 primary 에서 조회"""
+    return _load_current_user(token, db)
+
+
+def get_current_user_read(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db),
+) -> CurrentUser:
+    """읽기 전용 라우트용: 캐시 miss 시 복제본에서 조회"""
+    return _load_current_user(token, db)
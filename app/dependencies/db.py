@@ -0,0 +1,70 @@
+# app/dependencies/db.py
+import os
+from fastapi import Request
+from jose import JWTError
+from redis.exceptions import RedisError
+
+from app.core.security import decode_access_token
+from app.database import READ_DATABASE_URL, SessionLocal, ReadSessionLocal
+from app.queue import redis
+
+# 쓰기 직후 이 시간(초) 동안은 해당 유저의 읽기도 primary로 보냄 (read-your-writes)
+READ_YOUR_WRITES_SEC = int(os.getenv("READ_YOUR_WRITES_SEC", "5"))
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def _recent_write_key(user_id: int) -> str:
+    return f"db:recent_write:{user_id}"
+
+
+def user_id_from_request(request: Request) -> int | None:
+    """Authorization 헤더에서 user id만 꺼냄 (검증 실패는 None, 인증 에러는 get_current_user 담당)"""
+    auth = request.headers.get("Authorization") or ""
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        sub = decode_access_token(token).get("sub")
+    except JWTError:
+        return None
+
+    return int(sub) if sub is not None else None
+
+
+def mark_recent_write(user_id: int) -> None:
+    """쓰기 요청 성공 후 호출 → 잠시 동안 이 유저의 읽기를 primary로 고정"""
+    try:
+        redis.set(_recent_write_key(user_id), "1", ex=READ_YOUR_WRITES_SEC)
+    except RedisError:
+        pass
+
+
+def _has_recent_write(user_id: int | None) -> bool:
+    if user_id is None:
+        return False
+    try:
+        return bool(redis.exists(_recent_write_key(user_id)))
+    except RedisError:
+        # 판단 불가 → 안전하게 primary
+        return True
+
+
+def get_read_db(request: Request):
+    """
+    읽기 전용 라우트용 세션
+    - 복제본이 설정되어 있고, 최근 쓰기가 없는 유저면 복제본 사용
+    - 그 외에는 primary (get_db 와 동일)
+    - db.info["replica"] / db.info["recent_write"] 에 선택 결과 기록
+    """
+    recent_write = bool(READ_DATABASE_URL) and _has_recent_write(user_id_from_request(request))
+    use_replica = bool(READ_DATABASE_URL) and not recent_write
+    db = ReadSessionLocal() if use_replica else SessionLocal()
+    # 컨트롤러가 캐시 사용 여부를 정할 수 있게 (list_posts_controller)
+    db.info["replica"] = use_replica
+    db.info["recent_write"] = recent_write
+    try:
+        yield db
+    finally:
+        db.close()
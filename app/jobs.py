@@ -1,18 +1,68 @@
 # app/jobs.py
 import os
+import logging
+import time
 import requests
+from requests.adapters import HTTPAdapter
 
 from app import models
 from app.database import SessionLocal
-from app.queue import redis
-from app.crud.post_crud import apply_moderation_result
+from app.queue import (
+    redis,
+    MODERATION_PENDING_KEY,
+    MODERATION_BATCH_SCHEDULED_KEY,
+    MODERATION_RQ_BATCH,
+    schedule_moderation_batch,
+    claim_moderation,
+    ack_moderation,
+    retry_moderation,
+    moderation_member,
+    parse_moderation_member,
+)
+from app.metrics import MODERATION_BATCH_SIZE
+from app.crud.post_crud import (
+    apply_moderation_result,
+    add_post_views,
+    repair_comment_counts as repair_comment_counts_in_db,
+    load_moderation_targets,
+    set_post_image_variants,
+)
+from app.crud.user_crud import set_user_image_variants
+from app.crud.upload_crud import collect_unreferenced_uploads
+from app.counters import take_view_deltas, finish_view_flush
+from app.cache import invalidate_feed, invalidate_user, get_cached_verdicts, set_cached_verdicts
+from app.core.images import make_image_variants
+
+logger = logging.getLogger("jobs")
 
 AGENT_BASE_URL = os.getenv("AGENT_BASE_URL", "").rstrip("/")
 AI_TIMEOUT_SEC = float(os.getenv("AI_HTTP_TIMEOUT", "10"))
 
 ALLOWED = {"safe", "hidden", "review"}
 
+# agent 호출용 keep-alive 세션 (워커 프로세스 안에서 TCP/TLS 연결 재사용, app.worker.WarmWorker)
+AGENT_HTTP_POOL_SIZE = int(os.getenv("AGENT_HTTP_POOL_SIZE", "10"))
+agent_http = requests.Session()
+agent_http.headers.update({"X-Internal-Call": "true"})
+agent_http.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=AGENT_HTTP_POOL_SIZE))
+agent_http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=AGENT_HTTP_POOL_SIZE))
+
+# 배치: 최대 N 개 또는 첫 항목부터 T ms 까지 모아서 agent 한 번 호출
+MODERATION_BATCH_MAX_ITEMS = int(os.getenv("MODERATION_BATCH_MAX_ITEMS", "50"))
+MODERATION_BATCH_MAX_WAIT_MS = int(os.getenv("MODERATION_BATCH_MAX_WAIT_MS", "200"))
+
+
+def _parse_verdict(data: dict) -> tuple[str, str | None]:
+    """agent 응답 한 건 → (action, reason). 모르는 action 은 review"""
+    action = (data.get("action") or data.get("decision") or "review")
+    action = str(action).strip().lower()
+    if action not in ALLOWED:
+        action = "review"
+    return action, data.get("reason")
+
+
 def run_moderation(target_type: str, target_id: int, content: str):
+    """단건 모더레이션 (배치 도입 전에 enqueue 된 작업 호환용)"""
     lock_key = f"moderation:lock:{target_type}:{target_id}"
 
     try:
@@ -20,31 +70,12 @@ def run_moderation(target_type: str, target_id: int, content: str):
         if not AGENT_BASE_URL:
             return
 
-        # 1) Agent 호출
-        try:
-            res = requests.post(
-                f"{AGENT_BASE_URL}/moderate",
-                json={
-                    "target_type": target_type,
-                    "target_id": target_id,
-                    "content": content,
-                },
-                headers={"X-Internal-Call": "true"},
-                timeout=AI_TIMEOUT_SEC,
-            )
-            res.raise_for_status()
-            data = res.json()
-
-            action = (data.get("action") or data.get("decision") or "review")
-            action = str(action).strip().lower()
-            if action not in ALLOWED:
-                action = "review"
-
-            reason = data.get("reason")
-
-        except Exception as e:
-            action = "review"
-            reason = f"agent_error: {type(e).__name__}"
+        # 1) 판정 캐시 → 없으면 Agent 호출
+        cached = get_cached_verdicts([content])[0]
+        if cached is not None:
+            action, reason = cached
+        else:
+            action, reason = _call_agent(target_type, target_id, content)
 
         # 2) DB 반영 (CRUD)
         db = SessionLocal()
@@ -62,3 +93,317 @@ def run_moderation(target_type: str, target_id: int, content: str):
     finally:
         # 3) 락 해제는 어떤 경우에도
         redis.delete(lock_key)
+
+
+def _call_agent(target_type: str, target_id: int, content: str) -> tuple[str, str | None]:
+    """POST {AGENT_BASE_URL}/moderate 단건 판정 (실패 시 review)"""
+    try:
+        res = agent_http.post(
+            f"{AGENT_BASE_URL}/moderate",
+            json={
+                "target_type": target_type,
+                "target_id": target_id,
+                "content": content,
+            },
+            timeout=AI_TIMEOUT_SEC,
+        )
+        res.raise_for_status()
+        body = res.json()
+    except Exception as e:
+        return "review", f"agent_error: {type(e).__name__}"
+
+    action, reason = _parse_verdict(body)
+    set_cached_verdicts([(content, action, reason)], body.get("policy_version"))
+    return action, reason
+
+
+# -----------------------------
+# 모더레이션 배치 (moderation 큐, app.queue.promote_due_moderation 이 예약)
+# -----------------------------
+def run_moderation_batch() -> int:
+    """대기열에서 최대 N 개를 꺼내 /moderate/batch 한 번으로 판정. 처리한 항목 수 반환"""
+    # 1) N 개가 모이거나 T ms 가 지날 때까지 대기
+    deadline = time.monotonic() + MODERATION_BATCH_MAX_WAIT_MS / 1000
+    while time.monotonic() < deadline:
+        if redis.llen(MODERATION_PENDING_KEY) >= MODERATION_BATCH_MAX_ITEMS:
+            break
+        time.sleep(0.02)
+
+    # 2) 예약 플래그를 먼저 지움 → 이후 들어온 항목은 다음 배치를 예약
+    redis.delete(MODERATION_BATCH_SCHEDULED_KEY)
+    raw_items, lease = claim_moderation(MODERATION_BATCH_MAX_ITEMS)
+
+    # 한 배치로 다 못 꺼냈으면 바로 다음 배치 예약 (dispatcher 모드에서는 예약하지 않음)
+    if MODERATION_RQ_BATCH and redis.llen(MODERATION_PENDING_KEY) > 0:
+        schedule_moderation_batch()
+
+    if not raw_items:
+        return 0
+    if not AGENT_BASE_URL:
+        ack_moderation(raw_items, lease)    # agent 미설정이면 모더레이션 생략 (기존 동작)
+        return 0
+
+    try:
+        processed, failed = process_moderation_items(raw_items)
+    except Exception:
+        retry_moderation(raw_items, lease)   # DB/Redis 장애 등 → 조용한 시간 뒤 다시
+        raise
+
+    retry_moderation(failed, lease)
+    ack_moderation(raw_items, lease)
+    return processed
+
+
+def process_moderation_items(raw_items: list[str]) -> tuple[int, list[str]]:
+    """
+    꺼낸 항목 판정 + DB 반영 (RQ 배치 작업용, dispatcher 는 같은 단계를 비동기로)
+    → (판정한 항목 수, DB 반영에 실패한 항목)
+    """
+    # 본문/버전은 DB에서 (큐에는 대상 id 만)
+    items = load_moderation_items(raw_items)
+    if not items:
+        return 0, []
+    MODERATION_BATCH_SIZE.observe(len(items))
+
+    # 판정 캐시에 있는 항목은 agent 호출 없이
+    verdicts, misses = split_cached_verdicts(items)
+    if misses:
+        verdicts.update(_call_agent_batch(misses))
+
+    # 결과를 항목별로 DB 반영 (그 사이 수정된 대상은 건너뜀)
+    failed = apply_moderation_verdicts(items, verdicts)
+    return len(items), failed
+
+
+def load_moderation_items(raw_items: list[str]) -> list[dict]:
+    """대기 리스트 항목 → [{target_type, target_id, content, content_version}] (중복 제거, 삭제된 대상 제외)"""
+    targets = list(dict.fromkeys(parse_moderation_member(raw) for raw in raw_items))
+
+    db = SessionLocal()
+    try:
+        found = load_moderation_targets(db, targets)
+    finally:
+        db.close()
+
+    return [
+        {
+            "target_type": target_type,
+            "target_id": target_id,
+            "content": found[(target_type, target_id)][0],
+            "content_version": found[(target_type, target_id)][1],
+        }
+        for target_type, target_id in targets
+        if (target_type, target_id) in found
+    ]
+
+
+def agent_batch_payload(items: list[dict]) -> dict:
+    """/moderate/batch 요청 본문 (계약 필드만)"""
+    return {
+        "items": [
+            {"target_type": i["target_type"], "target_id": i["target_id"], "content": i["content"]}
+            for i in items
+        ]
+    }
+
+
+def apply_moderation_verdicts(
+    items: list[dict],
+    verdicts: dict[tuple[str, int], tuple[str, str | None]],
+) -> list[str]:
+    """배치 판정 결과를 항목별로 DB 반영 (결과가 빠진 항목은 review). 반영에 실패한 항목 반환"""
+    failed: list[str] = []
+    db = SessionLocal()
+    try:
+        for item in items:
+            key = (item["target_type"], int(item["target_id"]))
+            action, reason = verdicts.get(key, ("review", "agent_error: missing_result"))
+            try:
+                apply_moderation_result(
+                    db=db,
+                    target_type=item["target_type"],
+                    target_id=item["target_id"],
+                    action=action,
+                    reason=reason,
+                    content_version=item.get("content_version"),
+                )
+            except Exception:
+                # 한 건 실패가 배치 전체를 막지 않도록 (실패 항목은 호출한 쪽이 다시 예약)
+                db.rollback()
+                logger.exception("apply moderation failed: %s:%s", *key)
+                failed.append(moderation_member(*key))
+    finally:
+        db.close()
+    return failed
+
+
+def split_cached_verdicts(items: list[dict]) -> tuple[dict[tuple[str, int], tuple[str, str | None]], list[dict]]:
+    """(캐시에서 찾은 판정, agent 에 물어야 할 항목)"""
+    verdicts: dict[tuple[str, int], tuple[str, str | None]] = {}
+    misses: list[dict] = []
+
+    for item, cached in zip(items, get_cached_verdicts([i["content"] for i in items])):
+        if cached is None:
+            misses.append(item)
+        else:
+            verdicts[(item["target_type"], int(item["target_id"]))] = cached
+
+    return verdicts, misses
+
+
+def remember_verdicts(
+    items: list[dict],
+    verdicts: dict[tuple[str, int], tuple[str, str | None]],
+    policy_version: str | None,
+) -> None:
+    """agent 판정을 본문 해시 캐시에 저장"""
+    entries = []
+    for item in items:
+        verdict = verdicts.get((item["target_type"], int(item["target_id"])))
+        if verdict is not None:
+            entries.append((item["content"], *verdict))
+    set_cached_verdicts(entries, policy_version)
+
+
+def parse_batch_results(results: list[dict]) -> dict[tuple[str, int], tuple[str, str | None]]:
+    """agent 결과 → {(target_type, target_id): 판정} (형식이 잘못된 항목은 빼고, 빠진 대상은 review)"""
+    verdicts = {}
+    for r in results:
+        try:
+            key = (str(r.get("target_type")), int(r.get("target_id")))
+        except (TypeError, ValueError, AttributeError):
+            logger.warning("malformed agent result skipped: %r", r)
+            continue
+        verdicts[key] = _parse_verdict(r)
+    return verdicts
+
+
+def agent_error_verdicts(items: list[dict], e: Exception) -> dict[tuple[str, int], tuple[str, str | None]]:
+    reason = f"agent_error: {type(e).__name__}"
+    return {(i["target_type"], int(i["target_id"])): ("review", reason) for i in items}
+
+
+def _call_agent_batch(items: list[dict]) -> dict[tuple[str, int], tuple[str, str | None]]:
+    """
+    POST {AGENT_BASE_URL}/moderate/batch
+      요청: {"items": [{"target_type", "target_id", "content"}, ...]}  (agent_batch_payload)
+      응답: {"results": [{"target_type", "target_id", "action", "reason"}, ...], "policy_version"(선택)}
+    실패 시 전 항목 review
+    """
+    try:
+        res = agent_http.post(
+            f"{AGENT_BASE_URL}/moderate/batch",
+            json=agent_batch_payload(items),
+            timeout=AI_TIMEOUT_SEC,
+        )
+        res.raise_for_status()
+        body = res.json()
+    except Exception as e:
+        return agent_error_verdicts(items, e)
+
+    verdicts = parse_batch_results(body.get("results") or [])
+    remember_verdicts(items, verdicts, body.get("policy_version"))
+    return verdicts
+
+
+# -----------------------------
+# 조회수 write-behind flush (maintenance 큐, app.scheduler 가 주기 실행)
+# -----------------------------
+def flush_view_counts() -> int:
+    """Redis에 쌓인 조회수 delta를 MySQL에 일괄 반영. 반영한 조회수 합계 반환"""
+    lock_key = "maintenance:lock:flush_views"
+
+    # 워커가 여러 개여도 flush는 하나만
+    if not redis.set(lock_key, "1", nx=True, ex=120):
+        return 0
+
+    try:
+        flush_id, deltas = take_view_deltas()
+        if flush_id is None:
+            return 0
+
+        applied = False
+        if deltas:
+            db = SessionLocal()
+            try:
+                # 같은 flush_id 가 이미 커밋됐으면 (지난번 DB 커밋 후 Redis 삭제 전에 실패) 건너뜀
+                applied = add_post_views(db, deltas, flush_id)
+            finally:
+                db.close()
+
+        finish_view_flush()
+        return sum(deltas.values()) if applied else 0
+
+    finally:
+        redis.delete(lock_key)
+
+
+# -----------------------------
+# 댓글 수 보정 (maintenance 큐, app.scheduler 가 주기 실행)
+# -----------------------------
+def repair_comment_counts() -> int:
+    """posts.comment_count 를 실제 노출 댓글 수로 일괄 보정. 보정한 게시글 수 반환"""
+    db = SessionLocal()
+    try:
+        return repair_comment_counts_in_db(db)
+    finally:
+        db.close()
+
+
+# -----------------------------
+# 업로드 이미지 파생본 생성 (images 큐, 업로드 직후 enqueue)
+# -----------------------------
+def generate_image_variants(target_type: str, target_id: int, src_path: str) -> bool:
+    """썸네일/중간 크기 WebP 생성 후 경로 기록. 기록했으면 True"""
+    # 게시글: 피드용 thumb + 상세용 medium / 프로필: thumb 만
+    names = ("thumb", "medium") if target_type == "post" else ("thumb",)
+    variants = make_image_variants(src_path, names)
+    if not variants:
+        return False    # 원본 없음(이미 교체/삭제) 또는 애니메이션 → 원본 그대로 서빙
+
+    db = SessionLocal()
+    try:
+        if target_type == "post":
+            applied = set_post_image_variants(
+                db, target_id, src_path, variants.get("thumb"), variants.get("medium"),
+            )
+        elif target_type == "user":
+            applied = set_user_image_variants(db, target_id, src_path, variants.get("thumb"))
+        else:
+            applied = False
+    finally:
+        db.close()
+
+    if not applied:
+        # 그 사이 이미지가 바뀌었거나 대상이 삭제됨
+        # (파생본은 같은 내용을 쓰는 다른 참조와 공유되므로 삭제는 GC 에 맡김)
+        return False
+
+    if target_type == "post":
+        invalidate_feed()
+    else:
+        invalidate_user(target_id)
+    return True
+
+
+# -----------------------------
+# 참조 없는 업로드 파일 정리 (maintenance 큐, app.scheduler 가 주기 실행)
+# -----------------------------
+UPLOAD_GC_GRACE_SEC = int(os.getenv("UPLOAD_GC_GRACE_SEC", "3600"))
+
+
+def collect_upload_garbage() -> int:
+    """참조 0 인 업로드 파일(+파생본) 삭제. 삭제한 파일 수 반환"""
+    lock_key = "maintenance:lock:upload_gc"
+
+    if not redis.set(lock_key, "1", nx=True, ex=600):
+        return 0
+
+    try:
+        db = SessionLocal()
+        try:
+            return collect_unreferenced_uploads(db, UPLOAD_GC_GRACE_SEC)
+        finally:
+            db.close()
+    finally:
+        redis.delete(lock_key)
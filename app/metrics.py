@@ -0,0 +1,121 @@
+# app/metrics.py
+# Prometheus 커스텀 지표 정의
+# - prometheus_client 기본 레지스트리에 등록되므로 Instrumentator가 노출하는 /metrics 에 함께 나간다.
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# -----------------------------
+# DB 커넥션 풀
+# -----------------------------
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "설정된 커넥션 풀 크기",
+    ["engine"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "현재 사용 중(checkout)인 커넥션 수",
+    ["engine"],
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "pool_size를 넘어서 생성된 overflow 커넥션 수 (음수면 아직 채워지지 않은 슬롯)",
+    ["engine"],
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "커넥션 checkout 대기 시간(초)",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+def bind_db_pool_gauges(label: str, engine) -> None:
+    """스크레이프 시점에 engine.pool 상태를 읽도록 게이지 연결 (dispose 후 새 풀도 따라감)"""
+    DB_POOL_SIZE.labels(engine=label).set_function(lambda: engine.pool.size())
+    DB_POOL_CHECKED_OUT.labels(engine=label).set_function(lambda: engine.pool.checkedout())
+    DB_POOL_OVERFLOW.labels(engine=label).set_function(lambda: engine.pool.overflow())
+
+
+# -----------------------------
+# 앱 기동
+# -----------------------------
+APP_COLD_START = Gauge(
+    "app_cold_start_seconds",
+    "프로세스 import 시작부터 lifespan 준비 완료까지 걸린 시간(초)",
+)
+
+
+# -----------------------------
+# 캐시
+# -----------------------------
+FEED_CACHE_REQUESTS = Counter(
+    "feed_cache_requests_total",
+    "피드 페이지 캐시 조회 결과",
+    ["result"],    # hit / miss / error
+)
+
+USER_CACHE_REQUESTS = Counter(
+    "user_cache_requests_total",
+    "인증 유저(principal) 캐시 조회 결과",
+    ["result"],    # hit / miss / error
+)
+
+MODERATION_VERDICT_CACHE_REQUESTS = Counter(
+    "moderation_verdict_cache_requests_total",
+    "모더레이션 판정 캐시 조회 결과 (hit = 절약한 agent 판정 수)",
+    ["result"],    # hit / miss / error
+)
+
+
+# -----------------------------
+# 비밀번호 해싱 풀
+# -----------------------------
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending",
+    "해싱 풀에 들어가 있는 작업 수 (대기 + 실행 중)",
+)
+PASSWORD_HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds",
+    "해싱 작업이 풀에서 실행되기까지 기다린 시간(초)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "해싱/검증 1회 실행 시간(초)",
+    ["op"],    # hash / verify
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "대기열 상한 초과로 거절된 해싱 작업 수",
+)
+
+
+# -----------------------------
+# 모더레이션
+# -----------------------------
+MODERATION_BATCH_SIZE = Histogram(
+    "moderation_batch_size",
+    "agent 배치 호출 1회에 담긴 항목 수",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+MODERATION_OUTBOX_RELAYED = Counter(
+    "moderation_outbox_relayed_total",
+    "app.outbox_relay 가 moderation_outbox 에서 Redis 로 옮긴 요청 수",
+)
+MODERATION_IN_FLIGHT = Gauge(
+    "moderation_in_flight",
+    "app.moderation_dispatcher 에서 진행 중인 agent 호출 수",
+)
+
+
+# -----------------------------
+# RQ 워커 (app.worker.WarmWorker)
+# -----------------------------
+WORKER_JOB_DURATION = Histogram(
+    "worker_job_duration_seconds",
+    "작업 1건 실행 시간(초, 큐 대기 제외)",
+    ["queue", "func", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
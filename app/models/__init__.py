@@ -1,2 +1,5 @@
 from .user_model import User
-from .post_model import Post, Comment
\ No newline at end of file
+from .post_model import Post, Comment, PostLike
+from .upload_model import UploadBlob
+from .outbox_model import ModerationOutbox
+from .counter_model import ViewCountFlush
@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Index
+from app.database import Base
+from app.models.post_model import KST
+
+
+class ViewCountFlush(Base):
+    """
+    반영된 조회수 flush 기록 (app.jobs.flush_view_counts)
+    - flush 한 번마다 토큰 하나, 조회수 UPDATE 와 같은 트랜잭션에서 INSERT
+    - DB 커밋 후 Redis 삭제 전에 죽어서 같은 flush 를 다시 시도하면 토큰이 이미 있으므로 건너뜀
+    """
+    __tablename__ = "view_count_flushes"
+
+    flush_id = Column(String(36), primary_key=True)    # uuid4
+    applied_at = Column(DateTime, default=lambda: datetime.now(KST), nullable=False)
+
+    __table_args__ = (
+        Index("ix_view_count_flushes_applied_at", "applied_at"),
+    )
@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from app.database import Base
+from app.models.post_model import KST
+
+
+class ModerationOutbox(Base):
+    """
+    모더레이션 요청 outbox
+    - 게시글/댓글 쓰기와 같은 트랜잭션에서 INSERT → 커밋된 글은 반드시 판정 대상이 됨
+    - app.outbox_relay 가 id 순으로 꺼내 Redis debounce 집합에 넣고 삭제
+    """
+    __tablename__ = "moderation_outbox"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    target_type = Column(String(20), nullable=False)    # "post" / "comment"
+    target_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(KST))
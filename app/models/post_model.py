@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Enum, Index, true, false
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime, timedelta, timezone
@@ -7,21 +7,45 @@ from datetime import datetime, timedelta, timezone
 
 KST = timezone(timedelta(hours=9))
 
+# 피드 요약 길이 (글자 수, 넘으면 말줄임)
+EXCERPT_LENGTH = 120
+
+# 모더레이션 상태 (MySQL ENUM → 1바이트)
+MODERATION_STATUSES = ("PENDING", "SAFE", "REVIEW", "HIDDEN")
+
 class Post(Base):
     __tablename__ = "posts"
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
+
+    # 피드용 요약 (create_post / update_post 에서 계산 → 피드는 content 를 읽지 않음)
+    excerpt = Column(String(255), nullable=False, default="", server_default="")
+    content_length = Column(Integer, nullable=False, default=0, server_default="0")
+    has_image = Column(Boolean, nullable=False, default=False, server_default=false())
+
     image_path = Column(String(255), nullable=True)
+    # 파생 이미지 (images 큐에서 생성, 생성 전/실패 시 NULL → 원본 사용)
+    image_thumb_path = Column(String(255), nullable=True)     # 피드
+    image_medium_path = Column(String(255), nullable=True)    # 상세
     likes = Column(Integer, default=0)
     views = Column(Integer, default=0)
     created_at = Column(DateTime, default=lambda: datetime.now(KST))
 
+    # 노출 중인 댓글 수 (비정규화, 댓글 등록/삭제/모더레이션 시 원자 증감)
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)
+
     # agent용 추가
-    moderation_status = Column(String(20), default="PENDING", nullable=False)
+    moderation_status = Column(Enum(*MODERATION_STATUSES, name="moderation_status"), default="PENDING", nullable=False)
     moderation_reason = Column(String(255), nullable=True)
 
+    # 본문이 바뀔 때마다 +1 → 판정은 읽어 간 버전이 그대로일 때만 반영
+    content_version = Column(Integer, default=1, server_default="1", nullable=False)
+
+    # 노출 여부 (moderation_status != HIDDEN) → 피드 인덱스용
+    visible = Column(Boolean, default=True, server_default=true(), nullable=False)
+
     # 글쓴이 (User FK)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
@@ -34,7 +58,11 @@ class Post(Base):
         back_populates="post",
         cascade="all, delete-orphan"
     )
-    
+
+    __table_args__ = (
+        # 피드: WHERE visible = 1 ORDER BY id DESC (+ id < last_id)
+        Index("ix_posts_visible_id", "visible", "id"),
+    )
 
 
 class Comment(Base):
@@ -52,12 +80,36 @@ class Comment(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(KST))
 
-    moderation_status = Column(String(20), default="PENDING", nullable=False)
+    moderation_status = Column(Enum(*MODERATION_STATUSES, name="moderation_status"), default="PENDING", nullable=False)
     moderation_reason = Column(String(255), nullable=True)
 
+    # 본문 버전 (Post.content_version 과 동일)
+    content_version = Column(Integer, default=1, server_default="1", nullable=False)
+
+    # 노출 여부 (moderation_status != HIDDEN)
+    visible = Column(Boolean, default=True, server_default=true(), nullable=False)
+
     # 관계
     # Comment.post → Post
     post = relationship("Post", back_populates="comments")
 
     # Comment.user → User
     user = relationship("User", back_populates="comments")
+
+    __table_args__ = (
+        # 댓글 keyset: WHERE post_id = ? AND visible = 1 AND (created_at, id) > (?, ?) ORDER BY created_at, id
+        Index("ix_comments_post_visible_created_id", "post_id", "visible", "created_at", "id"),
+    )
+
+
+class PostLike(Base):
+    """좋아요 원장: 유저당 게시글 하나에 한 번 (PK = user_id + post_id)"""
+    __tablename__ = "post_likes"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(KST))
+
+    __table_args__ = (
+        Index("ix_post_likes_post_id", "post_id"),
+    )
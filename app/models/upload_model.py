@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.database import Base
+from app.models.post_model import KST
+
+
+class UploadBlob(Base):
+    """
+    업로드 파일 참조 수 (내용 주소 저장소)
+    - 같은 내용은 파일 하나를 공유, 게시글/프로필이 참조할 때마다 ref_count + 1
+    - ref_count 가 0 이 된 뒤 유예 시간이 지나면 GC 가 파일과 행을 삭제
+    """
+    __tablename__ = "upload_blobs"
+
+    path = Column(String(255), primary_key=True)     # {dest_dir}/{sha256}.{ext}
+    sha256 = Column(String(64), nullable=True)       # 해시 도입 전 uuid 파일은 NULL
+    size = Column(Integer, nullable=True)
+    ref_count = Column(Integer, default=0, server_default="0", nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(KST), onupdate=lambda: datetime.now(KST))
+
+    __table_args__ = (
+        # GC: WHERE ref_count = 0 AND updated_at < cutoff
+        Index("ix_upload_blobs_ref_count_updated_at", "ref_count", "updated_at"),
+    )
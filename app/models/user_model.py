@@ -11,6 +11,7 @@ class User(Base):
     password = Column(String(255), nullable=False)
     nickname = Column(String(255), unique=True, nullable=False)
     profile_image_path = Column(String(255), nullable=True)
+    profile_thumb_path = Column(String(255), nullable=True)   # 파생 썸네일 (images 큐)
 
     # 유저 삭제 시, 이 유저의 게시글/댓글도 같이 삭제
     posts = relationship(
@@ -0,0 +1,167 @@
+# app/moderation_dispatcher.py
+# asyncio 모더레이션 소비자 (python -m app.moderation_dispatcher)
+# - app.outbox_relay 가 예약한 대상을 기한이 되면 대기열(moderation:pending)로 옮기고 직접 소비
+# - agent 호출은 공유 httpx.AsyncClient 로 최대 MODERATION_CONCURRENCY 개까지 동시에
+#   (RQ 워커는 프로세스당 한 건씩 agent 응답을 기다리며 막힘)
+# - 밀려 있으면 한 번에 최대 MODERATION_BATCH_MAX_ITEMS 개를 /moderate/batch 로 묶음
+# - DB 반영은 app.jobs.apply_moderation_verdicts (apply_moderation_result) 를 스레드에서
+# - 꺼낸 항목은 app.queue.claim_moderation 임대 → 반영 후 ack, 실패하면 debounce 집합으로 되돌림
+# - 이 프로세스를 띄울 때는 scheduler 쪽도 MODERATION_RQ_BATCH=false (RQ 배치 작업 예약 끔)
+import os
+import signal
+import asyncio
+import logging
+import httpx
+from prometheus_client import start_http_server
+from redis.exceptions import RedisError
+
+from app.queue import claim_moderation, ack_moderation, retry_moderation, promote_due_moderation
+from app.metrics import MODERATION_BATCH_SIZE, MODERATION_IN_FLIGHT
+from app.jobs import (
+    AGENT_BASE_URL,
+    AI_TIMEOUT_SEC,
+    MODERATION_BATCH_MAX_ITEMS,
+    apply_moderation_verdicts,
+    parse_batch_results,
+    split_cached_verdicts,
+    remember_verdicts,
+    agent_error_verdicts,
+    agent_batch_payload,
+    load_moderation_items,
+)
+
+logger = logging.getLogger("moderation_dispatcher")
+
+MODERATION_CONCURRENCY = int(os.getenv("MODERATION_CONCURRENCY", "32"))
+IDLE_POLL_SEC = 0.1     # 대기열이 비었을 때 다시 확인하는 간격
+ERROR_BACKOFF_SEC = 1   # Redis 오류 후 대기
+PROMOTE_INTERVAL_SEC = 0.5
+DISPATCHER_METRICS_PORT = int(os.getenv("DISPATCHER_METRICS_PORT", "0"))    # 0 이면 노출 안 함
+
+
+async def _call_agent(client: httpx.AsyncClient, items: list[dict]):
+    try:
+        res = await client.post("/moderate/batch", json=agent_batch_payload(items))
+        res.raise_for_status()
+        body = res.json()
+    except Exception as e:
+        return agent_error_verdicts(items, e)
+
+    verdicts = parse_batch_results(body.get("results") or [])
+    await asyncio.to_thread(remember_verdicts, items, verdicts, body.get("policy_version"))
+    return verdicts
+
+
+async def _dispatch(client: httpx.AsyncClient, raw_items: list[str], lease: int) -> None:
+    MODERATION_IN_FLIGHT.inc()
+    try:
+        # 본문/버전은 DB에서 (큐에는 대상 id 만)
+        items = await asyncio.to_thread(load_moderation_items, raw_items)
+        failed: list[str] = []
+        if items:
+            MODERATION_BATCH_SIZE.observe(len(items))
+
+            # 판정 캐시에 있는 항목은 agent 호출 없이
+            verdicts, misses = await asyncio.to_thread(split_cached_verdicts, items)
+            if misses:
+                verdicts.update(await _call_agent(client, misses))
+            failed = await asyncio.to_thread(apply_moderation_verdicts, items, verdicts)
+
+        await asyncio.to_thread(retry_moderation, failed, lease)
+        await asyncio.to_thread(ack_moderation, raw_items, lease)
+    except Exception:
+        logger.exception("moderation dispatch failed (%d items), requeued", len(raw_items))
+        try:
+            await asyncio.to_thread(retry_moderation, raw_items, lease)
+        except Exception as e:
+            # Redis 도 안 되면 임대 만료 후 promote_due_moderation 이 되돌림
+            logger.warning("requeue failed: %s", type(e).__name__)
+    finally:
+        MODERATION_IN_FLIGHT.dec()
+
+
+async def _promote_due(stop: asyncio.Event) -> None:
+    """debounce 집합에서 기한 지난 대상을 대기 리스트로 (app.scheduler 와 겹쳐도 안전)"""
+    while not stop.is_set():
+        try:
+            await asyncio.to_thread(promote_due_moderation, False)
+        except Exception as e:
+            logger.warning("promote due moderation failed: %s", type(e).__name__)
+        await _wait(stop, PROMOTE_INTERVAL_SEC)
+
+
+async def run(stop: asyncio.Event) -> None:
+    slots = asyncio.Semaphore(MODERATION_CONCURRENCY)
+    tasks: set[asyncio.Task] = set()
+    promoter = asyncio.create_task(_promote_due(stop))
+
+    async with httpx.AsyncClient(
+        base_url=AGENT_BASE_URL,
+        headers={"X-Internal-Call": "true"},
+        timeout=AI_TIMEOUT_SEC,
+        limits=httpx.Limits(max_connections=MODERATION_CONCURRENCY, max_keepalive_connections=MODERATION_CONCURRENCY),
+    ) as client:
+        try:
+            while not stop.is_set():
+                await slots.acquire()
+
+                # 밀려 있는 만큼 한 번에 (한가할 땐 1건씩 바로), 꺼낸 항목은 ack 전까지 임대
+                try:
+                    raw_items, lease = await asyncio.to_thread(claim_moderation, MODERATION_BATCH_MAX_ITEMS)
+                except RedisError as e:
+                    # Redis 타임아웃/재연결 → 프로세스를 죽이지 않고 잠시 쉬었다 다시
+                    slots.release()
+                    logger.warning("claim moderation failed: %s", type(e).__name__)
+                    await _wait(stop, ERROR_BACKOFF_SEC)
+                    continue
+
+                if not raw_items:
+                    slots.release()
+                    await _wait(stop, IDLE_POLL_SEC)
+                    continue
+
+                task = asyncio.create_task(_dispatch(client, raw_items, lease))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                task.add_done_callback(lambda _: slots.release())
+        finally:
+            # 어떤 이유로 끝나든 진행 중인 호출은 끝까지 반영하고, promoter 도 정리
+            stop.set()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            await promoter
+
+
+async def _wait(stop: asyncio.Event, timeout: float) -> None:
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    if DISPATCHER_METRICS_PORT:
+        start_http_server(DISPATCHER_METRICS_PORT)
+
+    async def _main() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        # agent 미설정이면 모더레이션 없이 동작 (기존 no-op 과 동일) → 종료하지 않고 대기
+        # (종료하면 restart 정책 때문에 재시작을 반복함)
+        if not AGENT_BASE_URL:
+            logger.warning("AGENT_BASE_URL is not set; moderation dispatcher idle")
+            await stop.wait()
+            return
+
+        logger.info("moderation dispatcher started (concurrency=%d)", MODERATION_CONCURRENCY)
+        await run(stop)
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# app/outbox_relay.py
+# 모더레이션 outbox relay (python -m app.outbox_relay)
+# - moderation_outbox 를 id 순으로 배치 잠금(SKIP LOCKED) → Redis debounce 집합에 ZADD → 행 삭제
+# - Redis 반영 후 커밋 전에 죽으면 같은 행을 다시 보냄 (ZADD 라 중복 무해)
+# - Redis 장애 중에는 outbox 에 쌓였다가 복구 후 전달 (요청은 영향 없음)
+import os
+import time
+import signal
+import logging
+
+from app.database import SessionLocal
+from app.queue import push_moderation
+from app.crud.outbox_crud import take_moderation_outbox, delete_moderation_outbox
+from app.metrics import MODERATION_OUTBOX_RELAYED
+
+logger = logging.getLogger("outbox_relay")
+
+OUTBOX_RELAY_BATCH = int(os.getenv("OUTBOX_RELAY_BATCH", "500"))
+OUTBOX_RELAY_IDLE_SEC = float(os.getenv("OUTBOX_RELAY_IDLE_SEC", "0.5"))   # 비어 있을 때 폴링 간격
+
+
+def relay_once() -> int:
+    """outbox 한 배치를 Redis 로 옮기고 옮긴 행 수 반환"""
+    db = SessionLocal()
+    try:
+        rows = take_moderation_outbox(db, OUTBOX_RELAY_BATCH)
+        if not rows:
+            db.rollback()
+            return 0
+
+        push_moderation([(r.target_type, r.target_id) for r in rows])
+        delete_moderation_outbox(db, [r.id for r in rows])
+        db.commit()
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    stopping = False
+
+    def _stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    logger.info("outbox relay started (batch=%d)", OUTBOX_RELAY_BATCH)
+    while not stopping:
+        try:
+            moved = relay_once()
+        except Exception as e:
+            logger.warning("relay failed: %s", type(e).__name__)
+            moved = 0
+            time.sleep(1)
+
+        MODERATION_OUTBOX_RELAYED.inc(moved)
+
+        # 꽉 찬 배치면 바로 다음 배치, 아니면 잠시 대기
+        if moved < OUTBOX_RELAY_BATCH:
+            time.sleep(OUTBOX_RELAY_IDLE_SEC)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,26 @@
 # app/queue.py
 import os
+import json
+import time
 from redis import Redis
 from rq import Queue
 
 # 환경변수에서 Redis URL 읽기
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
+# 캐시/카운터는 요청마다 호출되므로 Redis 가 멈추면 빨리 실패해야 RedisError 폴백이 동작
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.5"))                  # 초
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "0.5"))  # 초
+
 # Redis 연결 (sync, RQ는 sync 기반)
+# - 커넥션 풀만 만들고 실제 접속은 첫 명령 시점 (import 시 네트워크 I/O 없음)
+# - API 서버는 DB_WARMUP_CONNECTIONS 설정 시 lifespan 에서 미리 ping
+# - 블로킹 명령(BLPOP 등)은 이 클라이언트로 보내지 않음 (socket_timeout 에 걸림)
 redis = Redis.from_url(
     REDIS_URL,
     decode_responses=True,   # str로 받기 (json/키 처리 편함)
+    socket_timeout=REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
 )
 
 # moderation 전용 큐
@@ -18,3 +29,176 @@ moderation_q = Queue(
     connection=redis,
     default_timeout=60,     # job 기본 제한 시간 (초)
 )
+
+# 주기/정리 작업 전용 큐 (app.scheduler 가 enqueue)
+maintenance_q = Queue(
+    name="maintenance",
+    connection=redis,
+    default_timeout=300,
+)
+
+# 업로드 이미지 파생본(썸네일 등) 생성 큐
+image_q = Queue(
+    name="images",
+    connection=redis,
+    default_timeout=120,
+)
+
+
+def enqueue_image_variants(target_type: str, target_id: int, src_path: str | None) -> None:
+    """업로드 직후 호출 → 워커가 파생 이미지 생성 (실패해도 원본으로 서빙되므로 요청은 계속)"""
+    if not src_path:
+        return
+    try:
+        image_q.enqueue(
+            "app.jobs.generate_image_variants",   # 문자열 참조 (app.jobs ↔ 컨트롤러 import 순환 방지)
+            target_type,
+            target_id,
+            src_path,
+            result_ttl=0,
+            failure_ttl=3600,
+        )
+    except Exception:
+        pass
+
+
+# -----------------------------
+# 모더레이션 대기열
+# - 요청 경로: 쓰기 트랜잭션에 moderation_outbox 행 추가 (Redis 호출 없음)
+# - app.outbox_relay: outbox → debounce 집합(moderation:due)에 ZADD (점수 = 지금 + 조용한 시간)
+#   → 짧은 시간 안에 여러 번 수정되면 점수만 뒤로 밀리고 한 번만 판정
+# - promote_due_moderation: 기한이 지난 대상을 대기 리스트(moderation:pending)로 원자적으로 이동
+#   (app.scheduler / app.moderation_dispatcher 가 주기적으로 호출)
+# - 소비(app.jobs.run_moderation_batch / app.moderation_dispatcher): 본문·버전은 DB에서 읽고,
+#   판정 반영 시 버전이 그대로일 때만 적용
+# - 꺼낸 항목은 임대(moderation:inflight, 점수 = 만료 ms)로 남겨 두고 DB 반영 후 ack
+#   → 처리 중 예외면 retry_moderation 으로 debounce 집합에 되돌림,
+#     프로세스가 죽으면 임대 만료 후 promote_due_moderation 이 대기열로 되돌림
+# -----------------------------
+MODERATION_DUE_KEY = "moderation:due"
+MODERATION_PENDING_KEY = "moderation:pending"
+MODERATION_INFLIGHT_KEY = "moderation:inflight"
+MODERATION_BATCH_SCHEDULED_KEY = "moderation:batch:scheduled"
+MODERATION_BATCH_SCHEDULED_TTL = 300    # 배치 작업이 유실돼도 이 시간 뒤에는 다시 예약 가능
+
+MODERATION_QUIET_SEC = float(os.getenv("MODERATION_QUIET_SEC", "5"))   # 마지막 수정 후 이만큼 조용하면 판정
+MODERATION_PROMOTE_LIMIT = 500
+MODERATION_LEASE_SEC = int(os.getenv("MODERATION_LEASE_SEC", "300"))    # 꺼낸 뒤 ack 없이 이 시간이 지나면 재처리
+
+# false 면 RQ 배치 작업을 예약하지 않음 → app.moderation_dispatcher 가 대기열을 단독 소비
+MODERATION_RQ_BATCH = os.getenv("MODERATION_RQ_BATCH", "true").lower() == "true"
+
+# 기한 지난 멤버를 ZSET → LIST 로 옮김 (여러 프로세스가 동시에 불러도 한 번만 이동)
+_PROMOTE_DUE_SCRIPT = redis.register_script(
+    """
+    local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+    if #due > 0 then
+        redis.call('ZREM', KEYS[1], unpack(due))
+        redis.call('RPUSH', KEYS[2], unpack(due))
+    end
+    return #due
+    """
+)
+
+
+# 대기 리스트에서 최대 N 개를 꺼내면서 임대 기록 (ZADD 점수 = 만료 시각 ms)
+_CLAIM_SCRIPT = redis.register_script(
+    """
+    local items = redis.call('LPOP', KEYS[1], tonumber(ARGV[1]))
+    if not items then
+        return {}
+    end
+    for _, m in ipairs(items) do
+        redis.call('ZADD', KEYS[2], ARGV[2], m)
+    end
+    return items
+    """
+)
+
+# 임대가 그대로일 때만 해제 (그 사이 다른 소비자가 다시 꺼낸 항목의 임대는 유지)
+_ACK_SCRIPT = redis.register_script(
+    """
+    local n = 0
+    for i = 2, #ARGV do
+        if redis.call('ZSCORE', KEYS[1], ARGV[i]) == ARGV[1] then
+            n = n + redis.call('ZREM', KEYS[1], ARGV[i])
+        end
+    end
+    return n
+    """
+)
+
+
+def moderation_member(target_type: str, target_id: int) -> str:
+    return f"{target_type}:{target_id}"
+
+
+def parse_moderation_member(raw: str) -> tuple[str, int]:
+    """대기 리스트 항목 → (target_type, target_id) (본문을 담던 예전 JSON 항목도 허용)"""
+    if raw.startswith("{"):
+        data = json.loads(raw)
+        return data["target_type"], int(data["target_id"])
+    target_type, _, target_id = raw.partition(":")
+    return target_type, int(target_id)
+
+
+def push_moderation(targets: list[tuple[str, int]]) -> None:
+    """
+    판정 예약 (조용한 시간 뒤 최신 본문으로 한 번, 다시 호출되면 기한만 연장)
+    - 요청 경로가 아니라 app.outbox_relay 가 moderation_outbox 를 옮길 때 호출
+    """
+    if not targets:
+        return
+    due = time.time() + MODERATION_QUIET_SEC
+    redis.zadd(MODERATION_DUE_KEY, {moderation_member(t, i): due for t, i in targets})
+
+
+def claim_moderation(count: int) -> tuple[list[str], int]:
+    """대기 리스트에서 최대 count 개를 임대로 꺼냄 → (항목, 임대 값). 처리 후 ack_moderation 필수"""
+    lease = int((time.time() + MODERATION_LEASE_SEC) * 1000)
+    items = _CLAIM_SCRIPT(keys=[MODERATION_PENDING_KEY, MODERATION_INFLIGHT_KEY], args=[count, lease])
+    return list(items or []), lease
+
+
+def ack_moderation(raw_items: list[str], lease: int) -> None:
+    """처리 끝난 항목의 임대 해제"""
+    if raw_items:
+        _ACK_SCRIPT(keys=[MODERATION_INFLIGHT_KEY], args=[lease, *raw_items])
+
+
+def retry_moderation(raw_items: list[str], lease: int) -> None:
+    """처리 실패 항목을 debounce 집합으로 되돌리고 임대 해제 (조용한 시간 뒤 다시 판정)"""
+    push_moderation([parse_moderation_member(raw) for raw in raw_items])
+    ack_moderation(raw_items, lease)
+
+
+def promote_due_moderation(schedule_rq: bool = True) -> int:
+    """
+    기한 지난 대상(+ 임대 만료 항목)을 대기 리스트로 이동하고, RQ 모드면 배치 작업 예약. 이동한 수 반환
+    - app.moderation_dispatcher 는 schedule_rq=False (대기열을 직접 소비하므로 RQ 와 경쟁하지 않게)
+    """
+    moved = int(_PROMOTE_DUE_SCRIPT(
+        keys=[MODERATION_DUE_KEY, MODERATION_PENDING_KEY],
+        args=[time.time(), MODERATION_PROMOTE_LIMIT],
+    ))
+    # 임대가 만료된 항목 (소비자가 ack 전에 죽음) → 대기 리스트로 (같은 스크립트, 점수 단위만 ms)
+    moved += int(_PROMOTE_DUE_SCRIPT(
+        keys=[MODERATION_INFLIGHT_KEY, MODERATION_PENDING_KEY],
+        args=[int(time.time() * 1000), MODERATION_PROMOTE_LIMIT],
+    ))
+    if moved and schedule_rq and MODERATION_RQ_BATCH:
+        schedule_moderation_batch()
+    return moved
+
+
+def schedule_moderation_batch() -> None:
+    """예약된 배치 작업이 없을 때만 하나 enqueue"""
+    if not redis.set(MODERATION_BATCH_SCHEDULED_KEY, "1", nx=True, ex=MODERATION_BATCH_SCHEDULED_TTL):
+        return
+
+    moderation_q.enqueue(
+        "app.jobs.run_moderation_batch",
+        job_timeout=120,
+        result_ttl=0,
+        failure_ttl=600,
+    )
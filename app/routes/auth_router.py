@@ -2,7 +2,7 @@ from fastapi import APIRouter, Form, File, UploadFile, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel 
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 
 from app.controllers.auth_controller import (
     login_controller,
@@ -13,7 +13,7 @@ from app.controllers.auth_controller import (
 )
 
 from app.core.security import create_access_token         
-from app.dependencies.auth import get_current_user        
+from app.dependencies.auth import CurrentUser, get_current_user, get_current_user_read
 from app.models.user_model import User                     
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -26,14 +26,14 @@ class LoginRequest(BaseModel):
 
 # ---- 로그인 API ----
 @router.post("/login")
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
+async def login(payload: LoginRequest, db: Session = Depends(get_async_db)):
     """
     1) 로그인 검증 (login_controller)
     2) 성공 시 JWT access_token 발급
     """
     data = payload.dict()
 
-    user: User = login_controller(db, data)
+    user: User = await login_controller(db, data)
 
     # JWT 토큰 발급 (sub에 user.id 사용)
     access_token = create_access_token(data={"sub": str(user.id)})
@@ -46,7 +46,8 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
             "id": user.id,
             "email": user.email,
             "nickname": user.nickname,
-            "profile_image_path": user.profile_image_path
+            "profile_image_path": user.profile_image_path,
+            "profile_thumb_path": user.profile_thumb_path,
         },
     }
 
@@ -59,7 +60,7 @@ async def signup(
     password_confirm: str = Form(...),
     nickname: str = Form(...),
     profile_image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_async_db),
 ):
     payload = {
         "email": email,
@@ -72,7 +73,7 @@ async def signup(
 
 # ---- 내 정보 조회 ----
 @router.get("/me")
-def read_me(current_user: User = Depends(get_current_user)):
+def read_me(current_user: CurrentUser = Depends(get_current_user_read)):
     """
     현재 로그인한 사용자 정보 반환
     Authorization: Bearer <token> 필요
@@ -84,6 +85,7 @@ def read_me(current_user: User = Depends(get_current_user)):
             "email": current_user.email,
             "nickname": current_user.nickname,
             "profile_image_path": current_user.profile_image_path,
+            "profile_thumb_path": current_user.profile_thumb_path,
         }
     }
 
@@ -94,8 +96,8 @@ def read_me(current_user: User = Depends(get_current_user)):
 async def update_profile(
     nickname: str = Form(...),
     profile_image: UploadFile | None = File(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
 
     updated_user = await update_profile_controller(
@@ -111,7 +113,8 @@ async def update_profile(
             "id": updated_user.id,
             "email": updated_user.email,
             "nickname": updated_user.nickname,
-            "profile_image_path": updated_user.profile_image_path
+            "profile_image_path": updated_user.profile_image_path,
+            "profile_thumb_path": updated_user.profile_thumb_path,
         }
     }
 
@@ -119,7 +122,7 @@ async def update_profile(
 @router.delete("/profile")
 def delete_profile(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user), 
+    current_user: CurrentUser = Depends(get_current_user), 
 ):
     return delete_account_controller(
         db=db,
@@ -129,17 +132,17 @@ def delete_profile(
 
 # ---- 비밀번호 변경 ----
 @router.put("/password")
-def update_password(
+async def update_password(
     new_password: str = Form(...),
     new_password_confirm: str = Form(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),  
+    db: Session = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),  
 ):
     payload = {
         "new_password": new_password,
         "new_password_confirm": new_password_confirm,
     }
-    return update_password_controller(
+    return await update_password_controller(
         db=db,
         user=current_user,        
         payload=payload,
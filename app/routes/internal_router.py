@@ -2,8 +2,13 @@ from fastapi import APIRouter, Request, HTTPException, Depends
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.schemas import ModerationResult
-from app.crud.post_crud import apply_moderation_result
+from app.schemas import (
+    ModerationResult,
+    ModerationResultBatch,
+    ModerationResultBatchResponse,
+    ModerationResultOutcome,
+)
+from app.crud.post_crud import apply_moderation_result, apply_moderation_results_bulk
 
 router = APIRouter(prefix="/internal", tags=["internal"])
 
@@ -23,7 +28,31 @@ def moderation_result(
         target_id=body.target_id,
         action=body.action,
         reason=body.reason,
+        content_version=body.content_version,
     )
 
     return {"success": True}
 
+
+# 판정 결과 일괄 반영 (밀린 판정을 한 번에 flush 할 때)
+@router.post("/moderation-results", response_model=ModerationResultBatchResponse)
+def moderation_results(
+    body: ModerationResultBatch,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    # agent 서버만 호출 가능
+    if request.headers.get("X-Internal-Call") != "true":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    results = [r.model_dump() for r in body.results]
+    outcomes = apply_moderation_results_bulk(db, results)
+
+    return ModerationResultBatchResponse(
+        applied=outcomes.count("applied"),
+        results=[
+            ModerationResultOutcome(target_type=r["target_type"], target_id=r["target_id"], outcome=o)
+            for r, o in zip(results, outcomes)
+        ],
+    )
+
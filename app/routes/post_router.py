@@ -1,35 +1,47 @@
 # app/routes/post_router.py
 from fastapi import APIRouter, Form, File, UploadFile, Body, Depends, Query, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
-from app.dependencies.auth import get_current_user
-from app.models.user_model import User
+from app.dependencies.auth import CurrentUser, get_current_user, get_current_user_read
 
-from app.database import get_db
+from app.database import get_db, get_async_db
+from app.dependencies.db import get_read_db
+from app.schemas import (
+    CommentPageResponse,
+    CommentWriteResponse,
+    PostDetailResponse,
+    PostListResponse,
+    PostWriteResponse,
+)
 from app.controllers.post_controller import (
     list_posts_controller,
     get_post_detail_controller,
+    list_comments_controller,
     create_post_controller,
     delete_post_controller,
     toggle_like_controller,
+    like_post_controller,
+    unlike_post_controller,
     add_comment_controller,
     update_comment_controller,
     delete_comment_controller,
     update_post_controller,
 )
 
-router = APIRouter(prefix="/posts", tags=["posts"])
+# 응답 직렬화는 orjson (datetime 등도 jsonable_encoder 없이 바로 인코딩)
+router = APIRouter(prefix="/posts", tags=["posts"], default_response_class=ORJSONResponse)
 
 
 # -----------------------------
 # 게시글 목록 조회 (커서 기반)
 # -----------------------------
-@router.get("")
+@router.get("", response_model=PostListResponse)
 def list_posts(
     last_id: int | None = Query(None, ge=1),
     size: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_current_user_read),
 ):
     return list_posts_controller(db=db, last_id=last_id, size=size)
 
@@ -37,27 +49,27 @@ def list_posts(
 # -----------------------------
 # 게시글 상세 조회
 # -----------------------------
-@router.get("/{post_id}")
+@router.get("/{post_id}", response_model=PostDetailResponse)
 def get_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),  
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_current_user_read),
 ):
-    return get_post_detail_controller(db, post_id)
+    return get_post_detail_controller(db, post_id, current_user)
 
 
 
 # -----------------------------
 # 게시글 작성
 # -----------------------------
-@router.post("")
+@router.post("", response_model=PostWriteResponse)
 async def create_post(
     background_tasks: BackgroundTasks,          
     title: str = Form(...),
     content: str = Form(...),
     image_file: UploadFile | None = File(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     return await create_post_controller(
         db=db,
@@ -76,7 +88,7 @@ async def create_post(
 def delete_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),   
+    current_user: CurrentUser = Depends(get_current_user),   
 ):
     return delete_post_controller(
         db=db,
@@ -88,15 +100,15 @@ def delete_post(
 # -----------------------------
 # 게시글 수정
 # -----------------------------
-@router.put("/{post_id}")
+@router.put("/{post_id}", response_model=PostWriteResponse)
 async def update_post(
     post_id: int,
     title: str = Form(...),
     content: str = Form(...),
     image_file: UploadFile | None = File(None),
     background_tasks: BackgroundTasks = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),   
+    db: Session = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),   
 ):
     return await update_post_controller(
         db=db,
@@ -110,29 +122,64 @@ async def update_post(
     
 
 # -----------------------------
-# 좋아요 토글
+# 좋아요 / 좋아요 취소 (멱등)
+# -----------------------------
+@router.put("/{post_id}/like")
+def like_post(
+    post_id: int,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    return like_post_controller(db, post_id, current_user)
+
+
+@router.delete("/{post_id}/like")
+def unlike_post(
+    post_id: int,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    return unlike_post_controller(db, post_id, current_user)
+
+
+# -----------------------------
+# 좋아요 토글 (기존 프론트 호환)
 # -----------------------------
 @router.post("/{post_id}/like")
 def toggle_like(
     post_id: int,
     liked: bool = Body(..., embed=True),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),   
+    current_user: CurrentUser = Depends(get_current_user),   
 ):
-    return toggle_like_controller(db, post_id, liked)
+    return toggle_like_controller(db, post_id, liked, current_user)
+
 
 
+# -----------------------------
+# 댓글 목록 조회 (keyset 커서)
+# -----------------------------
+@router.get("/{post_id}/comments", response_model=CommentPageResponse)
+def list_comments(
+    post_id: int,
+    cursor: str | None = Query(None),
+    size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_current_user_read),
+):
+    return list_comments_controller(db=db, post_id=post_id, cursor=cursor, size=size)
+
 
 # -----------------------------
 # 댓글 등록 (로그인 필요)
 # -----------------------------
-@router.post("/{post_id}/comments")
+@router.post("/{post_id}/comments", response_model=CommentWriteResponse)
 def add_comment(
     post_id: int,
     background_tasks: BackgroundTasks = None,
     content: str = Form(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),   
+    current_user: CurrentUser = Depends(get_current_user),   
 ):
     return add_comment_controller(
         db=db,
@@ -147,14 +194,14 @@ def add_comment(
 # -----------------------------
 # 댓글 수정 (로그인 필요)
 # -----------------------------
-@router.put("/{post_id}/comments/{comment_id}")
+@router.put("/{post_id}/comments/{comment_id}", response_model=CommentWriteResponse)
 def update_comment(
     post_id: int,
     comment_id: int,
     background_tasks: BackgroundTasks = None,
     content: str = Form(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),   
+    current_user: CurrentUser = Depends(get_current_user),   
 ):
     return update_comment_controller(
         db=db,
@@ -175,7 +222,7 @@ def delete_comment(
     post_id: int,
     comment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),  
+    current_user: CurrentUser = Depends(get_current_user),  
 ):
     return delete_comment_controller(
         db=db,
@@ -0,0 +1,54 @@
+# app/scheduler.py
+# 주기 작업 스케줄러 (python -m app.scheduler)
+# - 정해진 간격마다 maintenance 큐에 작업을 enqueue 만 하고, 실행은 RQ 워커가 담당
+# - 매 초 모더레이션 debounce 집합에서 기한 지난 대상을 대기열로 이동
+import os
+import time
+import logging
+
+from app.queue import maintenance_q, promote_due_moderation
+from app.jobs import flush_view_counts, repair_comment_counts, collect_upload_garbage
+
+logger = logging.getLogger("scheduler")
+
+VIEW_FLUSH_INTERVAL_SEC = int(os.getenv("VIEW_FLUSH_INTERVAL_SEC", "10"))
+COMMENT_COUNT_REPAIR_INTERVAL_SEC = int(os.getenv("COMMENT_COUNT_REPAIR_INTERVAL_SEC", "3600"))
+UPLOAD_GC_INTERVAL_SEC = int(os.getenv("UPLOAD_GC_INTERVAL_SEC", "3600"))
+
+# (작업 함수, 실행 간격 초)
+PERIODIC_JOBS = [
+    (flush_view_counts, VIEW_FLUSH_INTERVAL_SEC),
+    (repair_comment_counts, COMMENT_COUNT_REPAIR_INTERVAL_SEC),
+    (collect_upload_garbage, UPLOAD_GC_INTERVAL_SEC),
+]
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    next_run = {fn: 0.0 for fn, _ in PERIODIC_JOBS}
+
+    while True:
+        now = time.monotonic()
+
+        for fn, interval in PERIODIC_JOBS:
+            if now < next_run[fn]:
+                continue
+
+            try:
+                maintenance_q.enqueue(fn, result_ttl=0, failure_ttl=3600)
+            except Exception as e:
+                logger.warning("enqueue %s failed: %s", fn.__name__, type(e).__name__)
+
+            next_run[fn] = now + interval
+
+        # 모더레이션 debounce: 기한 지난 대상을 대기열로 (RQ 모드면 배치 작업도 예약)
+        try:
+            promote_due_moderation()
+        except Exception as e:
+            logger.warning("promote due moderation failed: %s", type(e).__name__)
+
+        time.sleep(1)
+
+
+if __name__ == "__main__":
+    main()
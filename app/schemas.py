@@ -1,8 +1,121 @@
-from pydantic import BaseModel
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Literal
 
 class ModerationResult(BaseModel):
     target_type: Literal["post", "comment"]
     target_id: int
     action: Literal["safe", "hidden", "review"]
-    reason: Optional[str] = None
\ No newline at end of file
+    reason: Optional[str] = None
+    content_version: Optional[int] = None   # 판정한 본문 버전 (다르면 반영하지 않음)
+
+
+class ModerationResultBatch(BaseModel):
+    results: list[ModerationResult] = Field(..., max_length=10000)
+
+
+class ModerationResultOutcome(BaseModel):
+    target_type: str
+    target_id: int
+    outcome: Literal["applied", "not_found", "stale", "duplicate"]
+
+
+class ModerationResultBatchResponse(BaseModel):
+    success: bool = True
+    applied: int
+    results: list[ModerationResultOutcome]
+
+
+# -----------------------------
+# 게시글/댓글 응답
+# - 조회 API 는 Core select 결과(row) → 이 모델로 바로 매핑 (ORM 엔티티 생성 없음)
+# - 쓰기 API 는 ORM 객체에서 속성으로 읽음 (from_attributes)
+# -----------------------------
+class CommentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    post_id: int
+    content: str
+    writer: str             # 화면에 보여줄 닉네임
+    user_id: int            # 작성자 FK
+    created_at: Optional[datetime] = None
+
+
+class PostSummary(BaseModel):
+    """피드 한 줄 (본문 대신 excerpt)"""
+    id: int
+    title: str
+    excerpt: str
+    content_length: int
+    has_image: bool
+    image_path: Optional[str] = None            # 썸네일 (생성 전이면 원본)
+    image_original_path: Optional[str] = None
+    likes: int
+    views: int
+    comment_count: int
+    created_at: Optional[datetime] = None
+    user_id: int
+    user_nickname: Optional[str] = None
+
+
+class PostListResponse(BaseModel):
+    success: bool = True
+    posts: list[PostSummary]
+    last_id: Optional[int] = None
+    has_more: bool
+
+
+class PostDetail(BaseModel):
+    id: int
+    title: str
+    content: str
+    image_path: Optional[str] = None            # 중간 크기 (생성 전이면 원본)
+    image_original_path: Optional[str] = None
+    likes: int
+    liked: bool
+    views: int
+    comment_count: int
+    created_at: Optional[datetime] = None
+    user_id: int
+    user_nickname: Optional[str] = None
+    comments: list[CommentOut]
+    comments_cursor: Optional[str] = None
+    comments_has_more: bool
+
+
+class PostDetailResponse(BaseModel):
+    success: bool = True
+    post: PostDetail
+
+
+class CommentPageResponse(BaseModel):
+    success: bool = True
+    comments: list[CommentOut]
+    cursor: Optional[str] = None
+    has_more: bool
+
+
+class PostOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    content: str
+    image_path: Optional[str] = None
+    likes: Optional[int] = 0
+    views: Optional[int] = 0
+    comment_count: int = 0
+    created_at: Optional[datetime] = None
+    user_id: int
+
+
+class PostWriteResponse(BaseModel):
+    success: bool = True
+    message: str
+    post: PostOut
+
+
+class CommentWriteResponse(BaseModel):
+    success: bool = True
+    comment: CommentOut
@@ -0,0 +1,48 @@
+# app/worker.py
+# RQ 워커 (rq worker -w app.worker.WarmWorker ...)
+# - 기본 Worker 는 작업마다 fork → 작업마다 새 DB 커넥션 / agent TCP·TLS 연결
+# - SimpleWorker 기반으로 같은 프로세스에서 실행 → SQLAlchemy 풀과 agent HTTP 세션(app.jobs)을 계속 재사용
+# - 작업별 실행 시간은 Prometheus 지표 + 로그로 남김 (WORKER_METRICS_PORT 지정 시 /metrics 노출)
+import os
+import time
+import logging
+from prometheus_client import start_http_server
+from rq.worker import SimpleWorker
+
+from app.database import engine, warm_up_pool
+from app.metrics import WORKER_JOB_DURATION
+
+logger = logging.getLogger("worker")
+
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))    # 0 이면 노출 안 함
+WORKER_WARMUP_CONNECTIONS = int(os.getenv("WORKER_WARMUP_CONNECTIONS", "1"))
+
+
+class WarmWorker(SimpleWorker):
+    def work(self, *args, **kwargs):
+        if WORKER_METRICS_PORT:
+            start_http_server(WORKER_METRICS_PORT)
+
+        # 첫 작업이 커넥션 수립 비용을 내지 않도록 미리 열어둠
+        if WORKER_WARMUP_CONNECTIONS > 0:
+            try:
+                warm_up_pool(engine, WORKER_WARMUP_CONNECTIONS)
+            except Exception as e:
+                logger.warning("warm-up failed: %s", type(e).__name__)
+
+        return super().work(*args, **kwargs)
+
+    def perform_job(self, job, queue) -> bool:
+        started = time.perf_counter()
+        ok = False
+        try:
+            ok = super().perform_job(job, queue)
+            return ok
+        finally:
+            elapsed = time.perf_counter() - started
+            WORKER_JOB_DURATION.labels(
+                queue=queue.name,
+                func=job.func_name,
+                status="ok" if ok else "failed",
+            ).observe(elapsed)
+            logger.info("%s %s %.1f ms (%s)", queue.name, job.func_name, elapsed * 1000, "ok" if ok else "failed")
@@ -1,17 +1,74 @@
 # app/main.py
-from fastapi import FastAPI
-from app.database import Base, engine
+import time
+_IMPORT_STARTED = time.perf_counter()   # cold start 측정 기준점
+
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from app.database import engine, read_engine, READ_DATABASE_URL, warm_up_pool
+from app.dependencies.db import WRITE_METHODS, mark_recent_write, user_id_from_request
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes.auth_router import router as auth_router
 from app.routes.post_router import router as post_router
 from app.routes.internal_router import router as internal_router
-from fastapi.staticfiles import StaticFiles
+from app.controllers.auth_controller import UPLOAD_DIR
+from app.controllers.post_controller import POST_UPLOAD_DIR
+from app.metrics import APP_COLD_START
+from app.queue import redis
+from app.core.static import ImmutableStaticFiles
+from app.core.uploads import UploadSizeLimitMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
-# 테이블 자동 생성용
-from app.models.user_model import User   
+logger = logging.getLogger("uvicorn.error")
+
+# 기동 시 미리 열어둘 DB 커넥션 수 (0이면 warm-up 생략)
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", "0"))
+
+# 업로드 파일 본문을 nginx 에 넘길 internal location (예: "/_protected", 비우면 앱이 직접 전송)
+UPLOAD_ACCEL_REDIRECT_PREFIX = os.getenv("UPLOAD_ACCEL_REDIRECT_PREFIX", "").rstrip("/")
+
+
+def _accel_redirect(directory: str) -> str | None:
+    return f"{UPLOAD_ACCEL_REDIRECT_PREFIX}/{directory}/" if UPLOAD_ACCEL_REDIRECT_PREFIX else None
+
+
+def _warm_up() -> None:
+    opened = warm_up_pool(engine, DB_WARMUP_CONNECTIONS)
+    if read_engine is not engine:
+        opened += warm_up_pool(read_engine, DB_WARMUP_CONNECTIONS)
+    redis.ping()
+    logger.info("warm-up: %d DB connections, redis ok", opened)
+
+
+# 스키마는 alembic 마이그레이션으로 관리 (create_all 제거)
+# 기동 시 한 번만 필요한 준비 작업은 여기서
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for directory in (UPLOAD_DIR, POST_UPLOAD_DIR):
+        os.makedirs(directory, exist_ok=True)
 
-app = FastAPI()
+    if DB_WARMUP_CONNECTIONS > 0:
+        try:
+            await run_in_threadpool(_warm_up)
+        except Exception as e:
+            # warm-up 실패로 기동을 막지는 않음 (첫 요청에서 다시 연결)
+            logger.warning("warm-up failed: %s", type(e).__name__)
+
+    cold_start = time.perf_counter() - _IMPORT_STARTED
+    APP_COLD_START.set(cold_start)
+    logger.info("cold start: %.1f ms", cold_start * 1000)
+
+    yield
+
+    engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 origins = [
@@ -27,26 +84,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# MySQL에 테이블 자동 생성
-Base.metadata.create_all(bind=engine)
+# 업로드 본문 크기 제한 (multipart 파싱/스풀 전에 413)
+app.add_middleware(UploadSizeLimitMiddleware)
+
+# 복제본 사용 시: 쓰기 성공한 유저는 잠시 primary에서 읽도록 표시 (read-your-writes)
+@app.middleware("http")
+async def mark_recent_writes(request: Request, call_next):
+    response = await call_next(request)
+
+    if READ_DATABASE_URL and request.method in WRITE_METHODS and response.status_code < 400:
+        user_id = user_id_from_request(request)
+        if user_id is not None:
+            await run_in_threadpool(mark_recent_write, user_id)
+
+    return response
+
 
 # 라우터 등록
 app.include_router(auth_router)
 app.include_router(post_router)
 app.include_router(internal_router)
 
-# Instrumentator 장착 
+# Instrumentator 장착
+# (기본 레지스트리를 노출하므로 app.metrics 의 DB 풀 지표도 /metrics 에 함께 나감)
 Instrumentator().instrument(app).expose(app)
 
 
+# 폴더는 lifespan 에서 만들어지므로 import 시점 존재 검사는 생략
+# 업로드 파일은 경로가 바뀌지 않으므로 immutable 캐시 + ETag/Range (app.core.static)
 app.mount(
     "/post_uploads",                 # URL prefix
-    StaticFiles(directory="post_uploads"),  # 실제 폴더 경로
+    ImmutableStaticFiles(
+        directory=POST_UPLOAD_DIR,   # 실제 폴더 경로
+        check_dir=False,
+        accel_redirect=_accel_redirect(POST_UPLOAD_DIR),
+    ),
     name="post_uploads"
 )
 
 app.mount(
     "/uploads",                      # URL prefix
-    StaticFiles(directory="uploads"),  # 실제 폴더 경로
+    ImmutableStaticFiles(
+        directory=UPLOAD_DIR,        # 실제 폴더 경로
+        check_dir=False,
+        accel_redirect=_accel_redirect(UPLOAD_DIR),
+    ),
     name="uploads"
 )
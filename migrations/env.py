@@ -0,0 +1,41 @@
+# migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import Base, DATABASE_URL, engine
+import app.models  # noqa: F401  (모델을 Base.metadata 에 등록)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """DB 접속 없이 SQL 스크립트만 출력 (alembic upgrade head --sql)"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,81 @@
+"""initial schema (users / posts / comments)
+
+기존에 create_all 로 만들어진 DB는 세 테이블이 이미 있으면 생성을 건너뜀
+(`alembic stamp 0001` 과 같은 효과, 이후 0002~ 는 그대로 적용)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INITIAL_TABLES = {"users", "posts", "comments"}
+
+
+def _existing_initial_tables() -> set[str]:
+    if context.is_offline_mode():     # --sql: 접속 없이 전체 스크립트 출력
+        return set()
+    return INITIAL_TABLES & set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    # create_all 로 만들어진 기존 DB → 이미 0001 상태
+    existing = _existing_initial_tables()
+    if existing == INITIAL_TABLES:
+        return
+    if existing:
+        raise RuntimeError(
+            f"initial tables partially exist ({sorted(existing)}); fix the schema or stamp manually"
+        )
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("password", sa.String(255), nullable=False),
+        sa.Column("nickname", sa.String(255), nullable=False, unique=True),
+        sa.Column("profile_image_path", sa.String(255), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "posts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("image_path", sa.String(255), nullable=True),
+        sa.Column("likes", sa.Integer(), nullable=True),
+        sa.Column("views", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("moderation_status", sa.String(20), nullable=False),
+        sa.Column("moderation_reason", sa.String(255), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    )
+    op.create_index("ix_posts_id", "posts", ["id"])
+
+    op.create_table(
+        "comments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("posts.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("writer", sa.String(50), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("moderation_status", sa.String(20), nullable=False),
+        sa.Column("moderation_reason", sa.String(255), nullable=True),
+    )
+    op.create_index("ix_comments_id", "comments", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("comments")
+    op.drop_table("posts")
+    op.drop_table("users")
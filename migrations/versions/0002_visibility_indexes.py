@@ -0,0 +1,64 @@
+"""moderation_status ENUM + visible 컬럼 + 피드/댓글 복합 인덱스
+
+- moderation_status != 'HIDDEN' (부정 조건) 대신 visible = 1 (등치 조건)으로 인덱스 range scan
+- posts:    (visible, id)                  → 피드 ORDER BY id DESC
+- comments: (post_id, visible, created_at) → 상세 댓글 ORDER BY created_at
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+MODERATION_STATUSES = ("PENDING", "SAFE", "REVIEW", "HIDDEN")
+TABLES = ("posts", "comments")
+
+
+def upgrade() -> None:
+    status_enum = sa.Enum(*MODERATION_STATUSES, name="moderation_status")
+    allowed = ", ".join(f"'{s}'" for s in MODERATION_STATUSES)
+
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column("visible", sa.Boolean(), nullable=False, server_default=sa.text("1")),
+        )
+        op.execute(f"UPDATE {table} SET visible = 0 WHERE moderation_status = 'HIDDEN'")
+
+        # ENUM 변환 전, 알 수 없는 값은 REVIEW 로 정리
+        op.execute(f"UPDATE {table} SET moderation_status = 'REVIEW' WHERE moderation_status NOT IN ({allowed})")
+        # SQLite 는 ALTER COLUMN 이 없으므로 batch 모드 (MySQL 은 그대로 ALTER TABLE)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                "moderation_status",
+                existing_type=sa.String(20),
+                type_=status_enum,
+                existing_nullable=False,
+            )
+
+    op.create_index("ix_posts_visible_id", "posts", ["visible", "id"])
+    op.create_index("ix_comments_post_visible_created", "comments", ["post_id", "visible", "created_at"])
+
+
+def downgrade() -> None:
+    # MySQL은 FK(post_id)용 인덱스가 하나는 있어야 하므로 단일 인덱스를 먼저 만든다
+    op.create_index("ix_comments_post_id", "comments", ["post_id"])
+    op.drop_index("ix_comments_post_visible_created", table_name="comments")
+    op.drop_index("ix_posts_visible_id", table_name="posts")
+
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                "moderation_status",
+                existing_type=sa.Enum(*MODERATION_STATUSES, name="moderation_status"),
+                type_=sa.String(20),
+                existing_nullable=False,
+            )
+            batch_op.drop_column("visible")
@@ -0,0 +1,28 @@
+"""post_likes 좋아요 원장 (user_id, post_id)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "post_likes",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_post_likes_post_id", "post_likes", ["post_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("post_likes")
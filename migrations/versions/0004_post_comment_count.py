@@ -0,0 +1,34 @@
+"""posts.comment_count (노출 댓글 수 비정규화) + 기존 데이터 채우기
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "posts",
+        sa.Column("comment_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE posts
+        SET comment_count = (
+            SELECT COUNT(*) FROM comments
+            WHERE comments.post_id = posts.id AND comments.visible = 1
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "comment_count")
@@ -0,0 +1,28 @@
+"""댓글 keyset 페이지네이션용 인덱스 (post_id, visible, created_at, id)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 새 인덱스를 먼저 만들어야 FK(post_id) 인덱스 요구사항을 계속 만족
+    op.create_index(
+        "ix_comments_post_visible_created_id",
+        "comments",
+        ["post_id", "visible", "created_at", "id"],
+    )
+    op.drop_index("ix_comments_post_visible_created", table_name="comments")
+
+
+def downgrade() -> None:
+    op.create_index("ix_comments_post_visible_created", "comments", ["post_id", "visible", "created_at"])
+    op.drop_index("ix_comments_post_visible_created_id", table_name="comments")
@@ -0,0 +1,27 @@
+"""업로드 이미지 파생본 경로 컬럼 (posts.image_thumb_path / image_medium_path, users.profile_thumb_path)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 기존 이미지는 NULL → 응답에서 원본으로 대체
+    op.add_column("posts", sa.Column("image_thumb_path", sa.String(255), nullable=True))
+    op.add_column("posts", sa.Column("image_medium_path", sa.String(255), nullable=True))
+    op.add_column("users", sa.Column("profile_thumb_path", sa.String(255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "profile_thumb_path")
+    op.drop_column("posts", "image_medium_path")
+    op.drop_column("posts", "image_thumb_path")
@@ -0,0 +1,50 @@
+"""upload_blobs 업로드 파일 참조 수 (내용 주소 저장소)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upload_blobs",
+        sa.Column("path", sa.String(255), primary_key=True),
+        sa.Column("sha256", sa.String(64), nullable=True),
+        sa.Column("size", sa.Integer(), nullable=True),
+        sa.Column("ref_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_upload_blobs_ref_count_updated_at", "upload_blobs", ["ref_count", "updated_at"])
+
+    # 기존 uuid 파일도 참조 수로 관리 (해시 없이 경로 기준)
+    op.execute(
+        """
+        INSERT INTO upload_blobs (path, ref_count, updated_at)
+        SELECT image_path, COUNT(*), CURRENT_TIMESTAMP
+        FROM posts
+        WHERE image_path IS NOT NULL
+        GROUP BY image_path
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO upload_blobs (path, ref_count, updated_at)
+        SELECT profile_image_path, COUNT(*), CURRENT_TIMESTAMP
+        FROM users
+        WHERE profile_image_path IS NOT NULL
+        GROUP BY profile_image_path
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("upload_blobs")
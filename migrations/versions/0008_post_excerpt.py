@@ -0,0 +1,76 @@
+"""posts.excerpt / content_length / has_image (피드용 요약 컬럼) + 기존 행 backfill
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# app.models.post_model.EXCERPT_LENGTH 와 같은 값 (마이그레이션은 앱 코드 변경과 독립적으로 고정)
+EXCERPT_LENGTH = 120
+BATCH_SIZE = 1000
+
+
+def _excerpt(content: str) -> str:
+    text = " ".join(content.split())
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    return text[:EXCERPT_LENGTH].rstrip() + "…"
+
+
+def upgrade() -> None:
+    op.add_column("posts", sa.Column("excerpt", sa.String(255), server_default="", nullable=False))
+    op.add_column("posts", sa.Column("content_length", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("posts", sa.Column("has_image", sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    posts = sa.table(
+        "posts",
+        sa.column("id", sa.Integer),
+        sa.column("content", sa.Text),
+        sa.column("excerpt", sa.String),
+        sa.column("content_length", sa.Integer),
+    )
+
+    op.execute("UPDATE posts SET has_image = 1 WHERE image_path IS NOT NULL")
+    # func.char_length → MySQL CHAR_LENGTH / SQLite length (둘 다 문자 수)
+    op.execute(posts.update().values(content_length=sa.func.char_length(posts.c.content)))
+
+    # excerpt 는 공백 정리가 필요해서 파이썬에서 계산
+    # - id 구간별 executemany 한 번, 구간마다 커밋 (autocommit_block: 긴 트랜잭션/왕복 N 회 방지)
+    set_excerpt = (
+        posts.update()
+        .where(posts.c.id == sa.bindparam("post_id"))
+        .values(excerpt=sa.bindparam("new_excerpt"))
+    )
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.select(posts.c.id, posts.c.content)
+                .where(posts.c.id > last_id)
+                .order_by(posts.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+
+            bind.execute(
+                set_excerpt,
+                [{"post_id": post_id, "new_excerpt": _excerpt(content or "")} for post_id, content in rows],
+            )
+            last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "has_image")
+    op.drop_column("posts", "content_length")
+    op.drop_column("posts", "excerpt")
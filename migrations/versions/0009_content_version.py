@@ -0,0 +1,24 @@
+"""posts / comments.content_version (모더레이션 판정 반영 시 버전 확인)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("posts", sa.Column("content_version", sa.Integer(), server_default="1", nullable=False))
+    op.add_column("comments", sa.Column("content_version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("comments", "content_version")
+    op.drop_column("posts", "content_version")
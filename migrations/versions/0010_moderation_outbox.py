@@ -0,0 +1,28 @@
+"""moderation_outbox (게시글/댓글 쓰기와 같은 트랜잭션의 모더레이션 요청)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "moderation_outbox",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column("target_type", sa.String(20), nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("moderation_outbox")
@@ -0,0 +1,28 @@
+"""view_count_flushes (조회수 flush 중복 반영 방지 토큰)
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "view_count_flushes",
+        sa.Column("flush_id", sa.String(36), primary_key=True),
+        sa.Column("applied_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_view_count_flushes_applied_at", "view_count_flushes", ["applied_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_view_count_flushes_applied_at", table_name="view_count_flushes")
+    op.drop_table("view_count_flushes")
@@ -0,0 +1,184 @@
+# scripts/bench_post_reads.py
+# 피드/댓글 응답 생성 CPU 비교 (page size 50)
+#   python -m scripts.bench_post_reads [반복 횟수]
+# - orm : ORM 엔티티 로딩 → dict 수동 복사 → jsonable_encoder → JSONResponse (이전 방식)
+# - core: Core row select → Pydantic 응답 모델 → ORJSONResponse (현재 방식)
+# - 임시 SQLite 파일에 시드 데이터를 넣고 측정 (DB 왕복 차이보다 파이썬 쪽 비용 비교용)
+# - 요청당 process_time (µs) 을 출력
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_DB_FILE = os.path.join(tempfile.mkdtemp(prefix="bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_FILE}"
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy.orm import joinedload, load_only
+
+from app.database import Base, SessionLocal, engine
+from app.models import User, Post, Comment
+from app.schemas import CommentOut, CommentPageResponse
+from app.crud.post_crud import list_comments_cursor
+from app.controllers.post_controller import _build_feed_page
+
+PAGE_SIZE = 50
+SEED_POSTS = 500
+SEED_COMMENTS = 500
+
+
+def seed() -> None:
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        user = User(email="bench@example.com", password="x", nickname="bench")
+        db.add(user)
+        db.flush()
+
+        base = datetime(2025, 1, 1)
+        body = "밤에 쓰는 글 " * 80
+        db.add_all(
+            Post(
+                title=f"post {i}", content=body, excerpt=body[:120], content_length=len(body),
+                has_image=bool(i % 3 == 0), image_path=f"post_uploads/{i:064x}.jpg" if i % 3 == 0 else None,
+                likes=i % 17, views=i * 3, comment_count=0, created_at=base + timedelta(minutes=i),
+                user_id=user.id,
+            )
+            for i in range(SEED_POSTS)
+        )
+        db.flush()
+        db.add_all(
+            Comment(
+                post_id=1, user_id=user.id, writer="bench", content=f"댓글 {i} " * 10,
+                created_at=base + timedelta(seconds=i),
+            )
+            for i in range(SEED_COMMENTS)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+# -----------------------------
+# 이전 방식 (ORM 엔티티)
+# -----------------------------
+def feed_orm(db) -> bytes:
+    posts = (
+        db.query(Post)
+        .options(
+            load_only(
+                Post.id, Post.title, Post.excerpt, Post.content_length, Post.has_image,
+                Post.image_path, Post.image_thumb_path,
+                Post.likes, Post.views, Post.comment_count, Post.created_at, Post.user_id,
+            ),
+            joinedload(Post.user).load_only(User.nickname),
+        )
+        .filter(Post.visible == True)
+        .order_by(Post.id.desc())
+        .limit(PAGE_SIZE)
+        .all()
+    )
+    page = {
+        "success": True,
+        "posts": [
+            {
+                "id": p.id,
+                "title": p.title,
+                "excerpt": p.excerpt,
+                "content_length": p.content_length,
+                "has_image": p.has_image,
+                "image_path": p.image_thumb_path or p.image_path,
+                "image_original_path": p.image_path,
+                "likes": p.likes,
+                "views": p.views,
+                "comment_count": p.comment_count,
+                "created_at": p.created_at,
+                "user_id": p.user_id,
+                "user_nickname": p.user.nickname if p.user else None,
+            }
+            for p in posts
+        ],
+        "last_id": posts[-1].id if posts else None,
+        "has_more": bool(posts),
+    }
+    return JSONResponse(jsonable_encoder(page)).body
+
+
+def comments_orm(db) -> bytes:
+    comments = (
+        db.query(Comment)
+        .filter(Comment.post_id == 1, Comment.visible == True)
+        .order_by(Comment.created_at.asc(), Comment.id.asc())
+        .limit(PAGE_SIZE + 1)
+        .all()
+    )
+    page = {
+        "success": True,
+        "comments": [
+            {
+                "id": c.id,
+                "post_id": c.post_id,
+                "content": c.content,
+                "writer": c.writer,
+                "user_id": c.user_id,
+                "created_at": c.created_at,
+            }
+            for c in comments[:PAGE_SIZE]
+        ],
+        "has_more": len(comments) > PAGE_SIZE,
+    }
+    return JSONResponse(jsonable_encoder(page)).body
+
+
+# -----------------------------
+# 현재 방식 (Core row + 응답 모델 + orjson)
+# -----------------------------
+def feed_core(db) -> bytes:
+    page = _build_feed_page(db, None, PAGE_SIZE)
+    return ORJSONResponse(page.model_dump(mode="json")).body
+
+
+def comments_core(db) -> bytes:
+    rows = list_comments_cursor(db, 1, None, PAGE_SIZE + 1)
+    page = CommentPageResponse(
+        comments=[CommentOut.model_validate(r) for r in rows[:PAGE_SIZE]],
+        has_more=len(rows) > PAGE_SIZE,
+    )
+    return ORJSONResponse(page.model_dump(mode="json")).body
+
+
+def measure(fn, iterations: int) -> float:
+    """요청당 CPU 시간 (µs), 요청마다 새 세션 (실제 요청과 같게)"""
+    for _ in range(20):     # warm-up
+        db = SessionLocal()
+        fn(db)
+        db.close()
+
+    start = time.process_time()
+    for _ in range(iterations):
+        db = SessionLocal()
+        fn(db)
+        db.close()
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seed()
+
+    for label, old, new in (
+        ("feed", feed_orm, feed_core),
+        ("comments", comments_orm, comments_core),
+    ):
+        old_us = measure(old, iterations)
+        new_us = measure(new, iterations)
+        print(
+            f"{label:<9} size={PAGE_SIZE}  orm {old_us:8.0f} µs/req  core {new_us:8.0f} µs/req  "
+            f"saved {old_us - new_us:8.0f} µs ({(1 - new_us / old_us) * 100:4.1f}%)"
+        )
+
+
+if __name__ == "__main__":
+    main()
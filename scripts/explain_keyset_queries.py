@@ -0,0 +1,194 @@
+# scripts/explain_keyset_queries.py
+# 피드/댓글 keyset 쿼리가 의도한 인덱스를 타는지 EXPLAIN 으로 확인 (alembic upgrade head 이후)
+#   DATABASE_URL=mysql+pymysql://... python -m scripts.explain_keyset_queries --seed   # 빈 DB 에 1M 행 시드 후 검사
+#   DATABASE_URL=mysql+pymysql://... python -m scripts.explain_keyset_queries          # 이미 시드된 DB 검사
+# - app.crud.post_crud 의 쿼리 빌더를 그대로 사용 (쿼리가 바뀌면 검사도 같이 바뀜)
+# - 행 수가 적으면 옵티마이저가 풀스캔을 골라도 이상하지 않으므로 posts/comments 각각 MIN_ROWS 이상 필요
+# - 인덱스 이름(key)과 접근 방식(type)을 모두 확인
+#     MySQL : EXPLAIN → key, type (ref / range 만 허용, ALL / index 는 실패)
+#     SQLite: EXPLAIN QUERY PLAN → "SEARCH <table> USING [COVERING] INDEX <key>" (SCAN 은 실패)
+# - 기대와 다르면 실행 계획을 출력하고 종료 코드 1
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select, text
+
+from app.database import engine
+from app.models import User, Post, Comment
+from app.crud.post_crud import list_posts_stmt, list_comments_stmt
+
+MIN_ROWS = 1_000_000
+SEED_BATCH = 10_000
+SEED_BASE = datetime(2025, 1, 1)
+
+# 댓글 검사 대상 게시글: 시드 댓글의 1/5 을 몰아줌 (나머지는 다른 게시글에 분산)
+HOT_POST_ID = 1
+HOT_POST_SHARE = 5
+
+ALLOWED_TYPES = {
+    "mysql": {"ref", "range"},
+    "sqlite": {"SEARCH"},
+}
+
+
+def build_checks(post_count: int, hot_comments: int) -> list[tuple]:
+    """(설명, 쿼리, 테이블, 기대 인덱스) — 다음 페이지 커서는 시드 데이터 중간 지점"""
+    mid = max(hot_comments // 2, 1)
+    return [
+        ("feed first page", list_posts_stmt(None, 10), "posts", "ix_posts_visible_id"),
+        ("feed next page", list_posts_stmt(post_count // 2, 10), "posts", "ix_posts_visible_id"),
+        (
+            "comments first page",
+            list_comments_stmt(HOT_POST_ID, None, 21),
+            "comments",
+            "ix_comments_post_visible_created_id",
+        ),
+        (
+            "comments next page",
+            list_comments_stmt(HOT_POST_ID, (SEED_BASE + timedelta(seconds=mid), mid), 21),
+            "comments",
+            "ix_comments_post_visible_created_id",
+        ),
+    ]
+
+
+# -----------------------------
+# 시드
+# -----------------------------
+def seed(conn, rows: int) -> None:
+    """posts / comments 각각 rows 개를 배치 INSERT (빈 DB 전제)"""
+    user_id = conn.execute(
+        insert(User).values(email="explain@example.com", password="x", nickname="explain")
+    ).inserted_primary_key[0]
+
+    body = "밤에 쓰는 글 " * 20
+    started = time.perf_counter()
+    for start in range(0, rows, SEED_BATCH):
+        conn.execute(
+            insert(Post),
+            [
+                {
+                    "title": f"post {i}", "content": body, "excerpt": body[:120],
+                    "content_length": len(body), "has_image": False,
+                    "likes": 0, "views": 0, "comment_count": 0,
+                    "moderation_status": "SAFE", "content_version": 1,
+                    # 약 1% 는 숨김 (visible 조건이 실제로 걸러내도록)
+                    "visible": i % 100 != 0,
+                    "created_at": SEED_BASE + timedelta(seconds=i),
+                    "user_id": user_id,
+                }
+                for i in range(start, min(start + SEED_BATCH, rows))
+            ],
+        )
+        conn.commit()
+    print(f"seeded posts: {rows} ({time.perf_counter() - started:.1f}s)")
+
+    hot = rows // HOT_POST_SHARE
+    started = time.perf_counter()
+    for start in range(0, rows, SEED_BATCH):
+        conn.execute(
+            insert(Comment),
+            [
+                {
+                    "post_id": HOT_POST_ID if i < hot else 2 + i % (rows - 1),
+                    "user_id": user_id, "writer": "explain", "content": f"댓글 {i}",
+                    "moderation_status": "SAFE", "content_version": 1,
+                    "visible": i % 100 != 0,
+                    "created_at": SEED_BASE + timedelta(seconds=i),
+                }
+                for i in range(start, min(start + SEED_BATCH, rows))
+            ],
+        )
+        conn.commit()
+    print(f"seeded comments: {rows} (post {HOT_POST_ID}: {hot}) ({time.perf_counter() - started:.1f}s)")
+
+
+def analyze(conn) -> None:
+    """대량 INSERT 직후 통계 갱신 (옵티마이저가 오래된 카디널리티로 판단하지 않도록)"""
+    if conn.dialect.name == "mysql":
+        conn.execute(text("ANALYZE TABLE posts, comments")).all()
+    else:
+        conn.execute(text("ANALYZE"))
+    conn.commit()
+
+
+# -----------------------------
+# EXPLAIN
+# -----------------------------
+def _compile(conn, stmt) -> tuple[str, tuple | dict]:
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    if conn.dialect.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    return compiled.string, params
+
+
+def explain(conn, stmt, table: str) -> tuple[list[dict], list[dict]]:
+    """(대상 테이블의 {type, key, rows} 목록, 전체 실행 계획)"""
+    sql, params = _compile(conn, stmt)
+
+    if conn.dialect.name == "mysql":
+        plan = [dict(row) for row in conn.exec_driver_sql("EXPLAIN " + sql, params).mappings()]
+        access = [
+            {"type": row.get("type"), "key": row.get("key"), "rows": row.get("rows")}
+            for row in plan
+            if row.get("table") == table
+        ]
+        return access, plan
+
+    plan = [dict(row) for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params).mappings()]
+    access = []
+    for row in plan:
+        words = row["detail"].split()
+        if len(words) < 2 or words[1] != table:
+            continue
+        index = re.search(r"USING (?:COVERING )?INDEX (\w+)", row["detail"])
+        access.append({"type": words[0], "key": index.group(1) if index else None, "rows": None})
+    return access, plan
+
+
+def main(argv: list[str]) -> int:
+    dialect = engine.dialect.name
+    if dialect not in ALLOWED_TYPES:
+        print(f"지원하지 않는 DB 입니다 (현재: {dialect})")
+        return 1
+
+    with engine.connect() as conn:
+        if "--seed" in argv:
+            seed(conn, MIN_ROWS)
+            analyze(conn)
+
+        post_count = conn.execute(select(func.count()).select_from(Post)).scalar_one()
+        comment_count = conn.execute(select(func.count()).select_from(Comment)).scalar_one()
+        if post_count < MIN_ROWS or comment_count < MIN_ROWS:
+            print(
+                f"posts={post_count}, comments={comment_count}: 각각 {MIN_ROWS} 행 이상 필요 "
+                f"(빈 DB 에서 --seed 로 시드)"
+            )
+            return 1
+
+        hot_comments = conn.execute(
+            select(func.count()).select_from(Comment).where(Comment.post_id == HOT_POST_ID)
+        ).scalar_one()
+        print(f"{dialect}: posts={post_count}, comments={comment_count} (post {HOT_POST_ID}: {hot_comments})")
+
+        failed = 0
+        for label, stmt, table, index in build_checks(post_count, hot_comments):
+            access, plan = explain(conn, stmt, table)
+            ok = bool(access) and all(
+                a["key"] == index and a["type"] in ALLOWED_TYPES[dialect] for a in access
+            )
+            summary = ", ".join(f"type={a['type']} key={a['key']} rows={a['rows']}" for a in access)
+            print(f"[{'ok' if ok else 'FAIL'}] {label}: {table} {summary} (expected {index})")
+            if not ok:
+                failed += 1
+                for row in plan:
+                    print("    ", row)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))